@@ -1,34 +1,287 @@
 """Microsoft Graph API client for OneDrive operations."""
 
+import asyncio
+import contextlib
+import dbm
+import hashlib
+import logging
+import pickle
+import random
+import shelve
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import orjson
 import requests
-from typing import List, Dict, Any
-from onedrive_downloader.config import GRAPH_API_ENDPOINT, DEFAULT_TIMEOUT_SECONDS, USER_AGENT
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, AsyncIterator
+from urllib.parse import urlsplit
+
+try:
+    # Optional: HTTP/2 multiplexing for concurrent enumeration (httpx[http2])
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+from onedrive_downloader.config import (
+    GRAPH_API_ENDPOINT,
+    GRAPH_BATCH_MAX_REQUESTS,
+    DEFAULT_TIMEOUT_SECONDS,
+    ENUMERATION_CONCURRENCY,
+    GRAPH_MAX_RETRIES,
+    GRAPH_RETRY_BACKOFF_FACTOR,
+    GRAPH_RETRY_STATUSES,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    LIST_CHILDREN_PAGE_SIZE,
+    LIST_CHILDREN_SELECT,
+    SHARED_ITEM_CACHE_MAX_ENTRIES,
+    SHARED_ITEM_CACHE_TTL_SECONDS,
+    USER_AGENT,
+)
 from onedrive_downloader.models import ImageItem
 from onedrive_downloader.utils import is_image_file
 
+# Listing query and headers: only request the fields needed to build ImageItems
+_LIST_CHILDREN_QUERY = f"$select={LIST_CHILDREN_SELECT}&$top={LIST_CHILDREN_PAGE_SIZE}"
+_LIST_CHILDREN_HEADERS = {'Prefer': f'odata.maxpagesize={LIST_CHILDREN_PAGE_SIZE}'}
+
+# Ask Graph for minimal OData annotations on every response
+_GRAPH_ACCEPT = 'application/json;odata.metadata=minimal'
+
+# Statuses with which a /content request hands back the item's download URL
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+
+# Errors from a locked, corrupt or unwritable on-disk shelve cache
+_DISK_CACHE_ERRORS = (*dbm.error, pickle.PickleError, EOFError)
+
+logger = logging.getLogger(__name__)
+
+# Graph host, parsed once for DNS warm-up
+_GRAPH_HOST = urlsplit(GRAPH_API_ENDPOINT).hostname
+
+# In-process cache of shared item metadata:
+# (access_token_hash, encoded_sharing_url) -> (expires_at, item)
+_shared_item_cache = OrderedDict()
+
+
+def prewarm_dns(host: str = _GRAPH_HOST, port: int = 443) -> threading.Thread:
+    """
+    Resolve a host in the background so the first connection skips the DNS lookup.
+
+    Args:
+        host: Host name to resolve (defaults to the Graph API host)
+        port: Port the connection will be made on
+
+    Returns:
+        The daemon thread performing the lookup
+    """
+    def resolve():
+        try:
+            socket.getaddrinfo(host, port)
+        except OSError:
+            # Best effort: the real connection reports any resolver failure
+            pass
+
+    thread = threading.Thread(target=resolve, daemon=True)
+    thread.start()
+    return thread
+
+
+def _to_image_item(item, prefix='') -> Optional[ImageItem]:
+    """
+    Build an ImageItem from a Graph driveItem dict, or None if it has no download URL.
+
+    prefix is the item's folder path relative to the album ('' or ending in '/').
+    """
+    get = item.get
+    download_url = get('@content.downloadUrl') or get('@microsoft.graph.downloadUrl')
+
+    if not download_url:
+        return None
+
+    # Positional arguments: (filename, download_url, size, mime_type)
+    return ImageItem(
+        prefix + item['name'],
+        download_url,
+        get('size', 0),
+        get('file', {}).get('mimeType', 'image/jpeg'),
+    )
+
+
+def _sort_children(items, images, folders=None, missing_urls=None, prefix=''):
+    """
+    Sort listed driveItems into image items and subfolders.
+
+    Shared by every enumerator, so the per-item rules live in one place.
+
+    Args:
+        items: Iterable of driveItem dicts
+        images: List that ImageItems are appended to
+        folders: Optional list that subfolder dicts are appended to; folders
+                 are ignored when None
+        missing_urls: Optional list that image dicts listed without a download
+                      URL are appended to (named with their relative path);
+                      such images are dropped when None
+        prefix: Folder path of the items relative to the album, '' or ending
+                in '/'; image filenames are prefixed with it so same-named
+                images from different folders stay apart
+    """
+    add_image = images.append
+
+    for item in items:
+        # Check if it's a folder
+        if 'folder' in item:
+            if folders is not None:
+                folders.append(item)
+
+        # Check if it's an image file
+        elif is_image_file(item):
+            image_item = _to_image_item(item, prefix)
+            if image_item:
+                add_image(image_item)
+            elif missing_urls is not None:
+                missing_urls.append({**item, 'name': prefix + item['name']} if prefix else item)
+
+
+def _folder_path(prefix, folder):
+    """Relative path prefix for the children of a subfolder listed under prefix."""
+    return f"{prefix}{folder['name']}/"
+
+
+class _HTTP2Response:
+    """aiohttp-style view of an httpx response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+
+    async def read(self):
+        return self._response.content
+
+    def raise_for_status(self):
+        self._response.raise_for_status()
+
+
+class _HTTP2Session:
+    """
+    Minimal aiohttp.ClientSession facade over an HTTP/2 httpx.AsyncClient.
+
+    Lets the async enumerators multiplex their listings over one connection
+    without caring which client library is underneath.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    @contextlib.asynccontextmanager
+    async def get(self, url, allow_redirects=True):
+        response = await self._client.get(url, follow_redirects=allow_redirects)
+        yield _HTTP2Response(response)
+
+
+class _JitteredRetry(Retry):
+    """Retry policy adding random jitter to the exponential backoff.
+
+    Keeps clients throttled at the same moment from retrying in lockstep.
+    """
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return backoff + random.uniform(0, self.backoff_factor)
+
+
+def _retry_delay(retry_after, attempt):
+    """
+    Seconds to wait before retrying a throttled or failed Graph request.
+
+    Args:
+        retry_after: Retry-After header value, if the response carried one
+        attempt: Zero-based number of the attempt that failed
+
+    Returns:
+        The Retry-After delay when given in seconds, else jittered exponential backoff
+    """
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form: fall back to backoff
+
+    return GRAPH_RETRY_BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, GRAPH_RETRY_BACKOFF_FACTOR)
+
+
+def _popleft_many(queue, count):
+    """Pop up to count entries from the left of a deque."""
+    return [queue.popleft() for _ in range(min(count, len(queue)))]
+
 
 class OneDriveAPIClient:
     """Client for interacting with Microsoft Graph API."""
 
-    def __init__(self, access_token):
+    def __init__(self, access_token, cache_file=None):
         """
         Initialize the API client with an access token.
 
         Args:
             access_token: OAuth access token for Microsoft Graph API
+            cache_file: Optional path of an on-disk (shelve) cache for shared
+                        item metadata, revalidated with ETags across runs
         """
         self.access_token = access_token
+        self.access_token_hash = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+        self.cache_file = cache_file
         self.base_url = GRAPH_API_ENDPOINT
         self.timeout = DEFAULT_TIMEOUT_SECONDS
 
+        # Names of images skipped because no download URL could be found for them
+        self.skipped_items: List[str] = []
+
         # Create session with default headers
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'User-Agent': USER_AGENT
+            'Accept': _GRAPH_ACCEPT,
+            'User-Agent': USER_AGENT,
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip, deflate',
+            **_LIST_CHILDREN_HEADERS,
         })
 
+        # Retry throttling (429, honouring Retry-After) and transient 5xx errors.
+        # The last response is returned as-is so callers still see HTTP errors.
+        retry = _JitteredRetry(
+            total=GRAPH_MAX_RETRIES,
+            backoff_factor=GRAPH_RETRY_BACKOFF_FACTOR,
+            status_forcelist=GRAPH_RETRY_STATUSES,
+            respect_retry_after_header=True,
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False,
+        )
+
+        # Larger pool so Graph and download hosts keep persistent connections
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=retry,
+        )
+        self.session.mount('https://', adapter)
+
     def get_shared_item(self, encoded_sharing_url):
         """
         Get metadata for a shared OneDrive item using its encoded sharing URL.
@@ -42,13 +295,47 @@ class OneDriveAPIClient:
         Returns:
             Dict containing the shared item metadata
 
+        Results are memoized in-process for SHARED_ITEM_CACHE_TTL_SECONDS. When
+        cache_file is set, the last response and its ETag are also kept on disk
+        and sent as If-None-Match, so an unchanged item costs a bodiless 304.
+
         Raises:
             requests.HTTPError: If the API request fails
         """
+        cache_key = (self.access_token_hash, encoded_sharing_url)
+        cached = _shared_item_cache.get(cache_key)
+
+        if cached and cached[0] > time.monotonic():
+            _shared_item_cache.move_to_end(cache_key)
+            return cached[1]
+
         url = f"{self.base_url}/shares/{encoded_sharing_url}/driveItem"
 
-        response = self.session.get(url, timeout=self.timeout)
+        headers = {}
+        stored = self._load_cached_item(encoded_sharing_url)
+        if stored:
+            headers['If-None-Match'] = stored['etag']
 
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and stored:
+            item = stored['item']
+        else:
+            item = self._parse_shared_item_response(response)
+
+            etag = response.headers.get('ETag')
+            if etag:
+                self._store_cached_item(encoded_sharing_url, etag, item)
+
+        _shared_item_cache[cache_key] = (time.monotonic() + SHARED_ITEM_CACHE_TTL_SECONDS, item)
+        _shared_item_cache.move_to_end(cache_key)
+        while len(_shared_item_cache) > SHARED_ITEM_CACHE_MAX_ENTRIES:
+            _shared_item_cache.popitem(last=False)
+
+        return item
+
+    def _parse_shared_item_response(self, response):
+        """Check a Shares API response for errors and decode its JSON body."""
         if response.status_code == 401:
             raise Exception(
                 "Authentication failed. Your access token may have expired. "
@@ -60,7 +347,31 @@ class OneDriveAPIClient:
             )
 
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+    def _load_cached_item(self, encoded_sharing_url):
+        """Return the {'etag', 'item'} entry stored on disk for a sharing URL, if any."""
+        if not self.cache_file:
+            return None
+
+        # The disk cache only saves a request, so a broken one means a plain GET
+        try:
+            with shelve.open(self.cache_file) as cache:
+                return cache.get(encoded_sharing_url)
+        except _DISK_CACHE_ERRORS as e:
+            logger.warning("Ignoring unreadable Graph cache %s: %s", self.cache_file, e)
+            return None
+
+    def _store_cached_item(self, encoded_sharing_url, etag, item):
+        """Persist a shared item and its ETag to the on-disk cache."""
+        if not self.cache_file:
+            return
+
+        try:
+            with shelve.open(self.cache_file) as cache:
+                cache[encoded_sharing_url] = {'etag': etag, 'item': item}
+        except _DISK_CACHE_ERRORS as e:
+            logger.warning("Could not update Graph cache %s: %s", self.cache_file, e)
 
     def list_children(self, drive_id, item_id):
         """
@@ -81,23 +392,29 @@ class OneDriveAPIClient:
         Raises:
             requests.HTTPError: If the API request fails
         """
-        url = f"{self.base_url}/drives/{drive_id}/items/{item_id}/children"
-        all_items = []
+        return list(self.iter_children(drive_id, item_id))
 
-        while url:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+    def iter_children(self, drive_id, item_id):
+        """
+        Yield the children of a OneDrive item, fetching pages as they are consumed.
 
-            # Add items from this page
-            all_items.extend(data.get('value', []))
+        Only one page of raw item dicts is held in memory at a time.
 
-            # Check for next page
-            url = data.get('@odata.nextLink')
+        Args:
+            drive_id: The drive ID containing the item
+            item_id: The item ID to list children for
 
-        return all_items
+        Yields:
+            Item dictionaries
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        url = f"{self.base_url}/drives/{drive_id}/items/{item_id}/children?{_LIST_CHILDREN_QUERY}"
+        for page in self._iter_pages(url):
+            yield from page
 
-    def list_shared_children(self, encoded_sharing_url):
+    def list_shared_children(self, encoded_sharing_url, item_id=None):
         """
         List all children of a shared item using the Shares API.
 
@@ -106,6 +423,8 @@ class OneDriveAPIClient:
 
         Args:
             encoded_sharing_url: Encoded sharing URL (format: u!{base64url})
+            item_id: Optional ID of a folder inside the shared item; lists the
+                     shared item itself when None
 
         Returns:
             List of item dictionaries
@@ -113,26 +432,296 @@ class OneDriveAPIClient:
         Raises:
             requests.HTTPError: If the API request fails
         """
-        url = f"{self.base_url}/shares/{encoded_sharing_url}/driveItem/children"
+        return list(self.iter_shared_children(encoded_sharing_url, item_id))
+
+    def iter_shared_children(self, encoded_sharing_url, item_id=None):
+        """
+        Yield the children of a shared item, fetching pages as they are consumed.
+
+        Only one page of raw item dicts is held in memory at a time.
+
+        Args:
+            encoded_sharing_url: Encoded sharing URL (format: u!{base64url})
+            item_id: Optional ID of a folder inside the shared item; lists the
+                     shared item itself when None
+
+        Yields:
+            Item dictionaries
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        url = self._shared_children_url(encoded_sharing_url, item_id)
+        for page in self._iter_pages(url):
+            yield from page
+
+    def _iter_pages(self, url):
+        """Yield the items of each page of a Graph collection, following @odata.nextLink."""
+        while url:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            yield data.get('value', [])
+
+            # Check for next page
+            url = data.get('@odata.nextLink')
+
+    def delta_children(self, drive_id, item_id, token=None):
+        """
+        List items under a folder that changed since a previous delta query.
+
+        Without a token every descendant of the folder is returned. The
+        returned delta link can be passed back as token on a later run to
+        retrieve only what was added, changed or deleted in the meantime.
+        Handles pagination automatically.
+
+        API Reference:
+        https://learn.microsoft.com/en-us/graph/api/driveitem-delta
+
+        Args:
+            drive_id: The drive ID containing the folder
+            item_id: The folder item ID
+            token: @odata.deltaLink from a previous call, or None for a full listing
+
+        Returns:
+            Tuple of (items, delta_link)
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        url = token or f"{self.base_url}/drives/{drive_id}/items/{item_id}/delta"
         all_items = []
+        delta_link = None
 
         while url:
             response = self.session.get(url, timeout=self.timeout)
+
+            # An expired delta token must be replaced by a full resync
+            if response.status_code == 410 and token:
+                return self.delta_children(drive_id, item_id)
+
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Add items from this page
             all_items.extend(data.get('value', []))
 
-            # Check for next page
+            # The last page carries the delta link instead of a next link
             url = data.get('@odata.nextLink')
+            delta_link = data.get('@odata.deltaLink', delta_link)
+
+        return all_items, delta_link
+
+    def get_delta_image_items(
+        self,
+        drive_id: str,
+        item_id: str,
+        token=None,
+        recursive: bool = True,
+        folder_paths: Optional[Dict[str, str]] = None
+    ):
+        """
+        Get image items added or changed under a folder since a previous delta query.
 
-        return all_items
+        Images in subfolders are named with their path relative to the folder.
+        Delta results carry no parent paths, and a later delta only returns the
+        folders that changed, so the caller keeps the folder paths between runs.
+
+        Args:
+            drive_id: The drive ID
+            item_id: The folder/album item ID
+            token: @odata.deltaLink from a previous call, or None for all images
+            recursive: If True, include images from subfolders
+            folder_paths: {folder_id: relative path prefix} saved from previous
+                          calls with the same token chain; updated in place
+                          with the folders returned by this call
+
+        Returns:
+            Tuple of (image_items, delta_link)
+
+        Raises:
+            requests.HTTPError: If API requests fail
+        """
+        items, delta_link = self.delta_children(drive_id, item_id, token)
+        image_items: List[ImageItem] = []
+        missing_urls = []
+
+        if folder_paths is None:
+            folder_paths = {}
+        paths = self._delta_folder_paths(items, item_id, folder_paths)
+        folder_paths.update(paths)
+
+        for item in items:
+            # Skip removals; folders are ignored by _sort_children
+            if 'deleted' in item:
+                continue
+
+            parent_id = item.get('parentReference', {}).get('id')
+            if not recursive and parent_id != item_id:
+                continue
+
+            # Unknown parents (outside the saved paths) fall back to the top level
+            _sort_children((item,), image_items, missing_urls=missing_urls, prefix=paths.get(parent_id, ''))
+
+        image_items.extend(self._resolve_download_urls(missing_urls, self._drive_content_url(drive_id)))
+        return image_items, delta_link
+
+    def _delta_folder_paths(self, items, root_id, known_paths):
+        """
+        Compute relative path prefixes for the folders in a delta result.
+
+        Folders returned by this delta take precedence over known_paths, so
+        renames apply to what is downloaded from now on.
+
+        Returns:
+            {folder_id: path prefix} for the root, the returned folders and known_paths
+        """
+        folders = {
+            item['id']: item for item in items
+            if 'folder' in item and 'deleted' not in item and item['id'] != root_id
+        }
+        paths = {root_id: ''}
+
+        def path_of(folder_id):
+            if folder_id in paths:
+                return paths[folder_id]
+            folder = folders.get(folder_id)
+            if folder is None:
+                return known_paths.get(folder_id, '')
+            # Guard against cycles in malformed results
+            paths[folder_id] = ''
+            paths[folder_id] = _folder_path(path_of(folder.get('parentReference', {}).get('id')), folder)
+            return paths[folder_id]
+
+        for folder_id in folders:
+            path_of(folder_id)
+
+        return {**known_paths, **paths}
+
+    def _shared_children_url(self, encoded_sharing_url, item_id=None):
+        """Build the Shares API children listing URL for the shared item or a folder inside it."""
+        if item_id is None:
+            path = f"/shares/{encoded_sharing_url}/driveItem/children"
+        else:
+            path = f"/shares/{encoded_sharing_url}/items/{item_id}/children"
+        return f"{self.base_url}{path}?{_LIST_CHILDREN_QUERY}"
+
+    def batch_list_children(self, pairs, next_links=()):
+        """
+        List children of several folders with a single JSON batch request.
+
+        Each (drive_id, item_id) pair and each pending continuation link becomes
+        one sub-request of the batch, so the caller must keep the combined count
+        within GRAPH_BATCH_MAX_REQUESTS. Results name the folder they belong to.
+
+        API Reference:
+        https://learn.microsoft.com/en-us/graph/json-batching
+
+        Args:
+            pairs: Iterable of (drive_id, item_id) tuples to list children for
+            next_links: Iterable of (drive_id, item_id, next_link) tuples
+                        continuing pagination from a previous batch
+
+        Returns:
+            Tuple of (children, next_links):
+            - children: List of (drive_id, item_id, items) tuples, one per sub-request
+            - next_links: List of (drive_id, item_id, next_link) tuples for
+              sub-requests that have more pages
+
+        Sub-requests answered with a throttling or transient error status are
+        resent in a follow-up batch, honouring their Retry-After header.
+
+        Raises:
+            requests.HTTPError: If the batch or any of its sub-requests fails
+        """
+        requests_to_send = [
+            (drive_id, item_id, f"/drives/{drive_id}/items/{item_id}/children?{_LIST_CHILDREN_QUERY}")
+            for drive_id, item_id in pairs
+        ]
+        requests_to_send.extend(
+            (drive_id, item_id, self._relative_url(link)) for drive_id, item_id, link in next_links
+        )
+
+        children = []
+        continuations = []
+        pending = range(len(requests_to_send))
+
+        # The session only retries the $batch POST itself; throttled or failed
+        # sub-requests come back inside a 200 and are resent here
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            payload = {
+                'requests': [
+                    {
+                        'id': str(index),
+                        'method': 'GET',
+                        'url': requests_to_send[index][2],
+                        'headers': _LIST_CHILDREN_HEADERS,
+                    }
+                    for index in pending
+                ]
+            }
+
+            response = self.session.post(
+                f"{self.base_url}/$batch",
+                json=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            retry = []
+            retry_after = None
+
+            for sub_response in orjson.loads(response.content).get('responses', []):
+                index = int(sub_response['id'])
+                drive_id, item_id, url = requests_to_send[index]
+                status = sub_response.get('status', 500)
+                body = sub_response.get('body') or {}
+
+                if status in GRAPH_RETRY_STATUSES and attempt < GRAPH_MAX_RETRIES:
+                    retry.append(index)
+                    header = (sub_response.get('headers') or {}).get('Retry-After')
+                    if header is not None:
+                        retry_after = max(_retry_delay(header, attempt), retry_after or 0)
+                    continue
+
+                if status >= 400:
+                    message = body.get('error', {}).get('message', 'Unknown error')
+                    raise requests.HTTPError(
+                        f"Batch request for {url} failed with status {status}: {message}"
+                    )
+
+                children.append((drive_id, item_id, body.get('value', [])))
+
+                # Queue the next page for the following batch
+                next_link = body.get('@odata.nextLink')
+                if next_link:
+                    continuations.append((drive_id, item_id, next_link))
+
+            if not retry:
+                break
+
+            pending = retry
+            time.sleep(_retry_delay(retry_after, attempt))
+
+        return children, continuations
+
+    def _relative_url(self, url):
+        """Strip the Graph endpoint from an absolute URL (batch sub-requests must be relative)."""
+        if url.startswith(self.base_url):
+            return url[len(self.base_url):]
+        return url
 
     def get_image_items(self, drive_id: str, item_id: str, recursive: bool = True) -> List[ImageItem]:
         """
         Get all image items from a OneDrive folder/album.
 
+        Folders are walked breadth-first: every folder discovered at one level
+        is listed in the same batch request(s), so the number of round trips
+        grows with folder depth rather than folder count. Images in subfolders
+        are named with their path relative to the folder.
+
         Args:
             drive_id: The drive ID
             item_id: The folder/album item ID
@@ -144,72 +733,397 @@ class OneDriveAPIClient:
         Raises:
             requests.HTTPError: If API requests fail
         """
-        children = self.list_children(drive_id, item_id)
+        pending_folders = deque([(drive_id, item_id)])
+        pending_links = deque()
         image_items: List[ImageItem] = []
+        subfolders = [] if recursive else None
+        missing_urls = {}
 
-        for item in children:
-            # Check if it's a folder
-            if 'folder' in item and recursive:
-                # Recursively get images from subfolder
-                subfolder_images = self.get_image_items(
-                    drive_id,
-                    item['id'],
-                    recursive=True
+        # Relative path prefix of every folder queued so far
+        prefixes = {(drive_id, item_id): ''}
+
+        while pending_folders or pending_links:
+            # Continuations go first so partially listed folders finish early
+            links = _popleft_many(pending_links, GRAPH_BATCH_MAX_REQUESTS)
+            folders = _popleft_many(pending_folders, GRAPH_BATCH_MAX_REQUESTS - len(links))
+
+            children, next_links = self.batch_list_children(folders, links)
+            pending_links.extend(next_links)
+
+            for folder_drive_id, folder_id, items in children:
+                prefix = prefixes[(folder_drive_id, folder_id)]
+                _sort_children(
+                    items, image_items, subfolders, missing_urls.setdefault(folder_drive_id, []), prefix
                 )
-                image_items.extend(subfolder_images)
 
-            # Check if it's an image file
-            elif is_image_file(item):
-                # Get download URL
-                download_url = item.get('@microsoft.graph.downloadUrl')
+                # Queue subfolders for the next batch
+                for folder in subfolders or ():
+                    key = (folder_drive_id, folder['id'])
+                    prefixes[key] = _folder_path(prefix, folder)
+                    pending_folders.append(key)
+                if subfolders:
+                    subfolders.clear()
 
-                if download_url:
-                    image_items.append(ImageItem(
-                        filename=item['name'],
-                        download_url=download_url,
-                        size=item.get('size', 0),
-                        mime_type=item.get('file', {}).get('mimeType', 'image/jpeg'),
-                    ))
+        for folder_drive_id, items in missing_urls.items():
+            image_items.extend(self._resolve_download_urls(items, self._drive_content_url(folder_drive_id)))
 
         return image_items
 
-    def get_shared_album_images(self, encoded_sharing_url: str, recursive: bool = False) -> List[ImageItem]:
+    def get_shared_album_images(
+        self,
+        encoded_sharing_url: str,
+        recursive: bool = False,
+        first_page: Optional[List[Dict[str, Any]]] = None,
+        next_link: Optional[str] = None
+    ) -> List[ImageItem]:
         """
         Get all image items from a shared album using the Shares API.
 
         This method works entirely through the Shares API path and doesn't
-        require direct drive access.
+        require direct drive access. It runs get_shared_album_images_async in
+        a new event loop, so it must not be called from a running one.
 
         Args:
             encoded_sharing_url: Encoded sharing URL (format: u!{base64url})
-            recursive: If True, recursively search subfolders (currently only
-                       top-level items are returned via Shares API)
+            recursive: If True, recursively search subfolders
+            first_page: Already fetched top-level children (see
+                        get_album_info_and_first_page); listing then resumes
+                        from next_link instead of the first page
+            next_link: Continuation link for first_page, if any
 
         Returns:
             List of ImageItem objects
 
         Raises:
-            requests.HTTPError: If API requests fail
+            aiohttp.ClientResponseError: If API requests fail
+            httpx.HTTPStatusError: If API requests fail over HTTP/2
+        """
+        return asyncio.run(self.get_shared_album_images_async(
+            encoded_sharing_url, recursive, first_page, next_link
+        ))
+
+    def _max_sync_workers(self):
+        """Thread count for sync enumeration: never more than the adapter keeps connections for."""
+        return min(ENUMERATION_CONCURRENCY, HTTP_POOL_MAXSIZE)
+
+    def _drive_content_url(self, drive_id):
+        """Return a callable mapping an item ID in a drive to its /content URL."""
+        return lambda child_id: f"{self.base_url}/drives/{drive_id}/items/{child_id}/content"
+
+    def _shared_content_url(self, encoded_sharing_url):
+        """Return a callable mapping an item ID in a shared item to its /content URL."""
+        return lambda child_id: f"{self.base_url}/shares/{encoded_sharing_url}/items/{child_id}/content"
+
+    def _download_location(self, url):
+        """Return the download URL a /content endpoint redirects to, or None."""
+        try:
+            response = self.session.get(url, allow_redirects=False, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+
+        if response.status_code in _REDIRECT_STATUSES:
+            return response.headers.get('Location')
+        return None
+
+    def _resolve_download_urls(self, items, content_url):
         """
-        children = self.list_shared_children(encoded_sharing_url)
+        Resolve download URLs for image items that were listed without one.
+
+        Sync counterpart of _resolve_download_urls_async: the /content redirects
+        are requested on a thread pool sharing the session's connection pool.
+
+        Args:
+            items: Raw driveItem dicts lacking a download URL annotation
+            content_url: Callable mapping an item ID to its /content URL
+
+        Returns:
+            List of ImageItem objects for the items that could be resolved
+        """
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self._max_sync_workers(), len(items))) as executor:
+            locations = list(executor.map(self._download_location, (content_url(item['id']) for item in items)))
+
+        return self._resolved_items(items, locations)
+
+    def _resolved_items(self, items, locations):
+        """Build ImageItems from resolved locations, recording the items that stay unresolved."""
+        image_items = []
+        for item, location in zip(items, locations):
+            if isinstance(location, str) and location:
+                image_items.append(_to_image_item({**item, '@content.downloadUrl': location}))
+            else:
+                self.skipped_items.append(item['name'])
+        return image_items
+
+    def _create_async_session(self):
+        """
+        Create an authenticated async session for concurrent enumeration.
+
+        Uses an HTTP/2 httpx client when httpx[http2] is installed, so concurrent
+        listings share one multiplexed connection; falls back to aiohttp otherwise.
+        """
+        headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Accept': _GRAPH_ACCEPT,
+            'User-Agent': USER_AGENT,
+            **_LIST_CHILDREN_HEADERS,
+        }
+
+        if httpx is not None:
+            return _HTTP2Session(httpx.AsyncClient(
+                http2=True,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_CONNECTIONS,
+                    max_keepalive_connections=ENUMERATION_CONCURRENCY,
+                ),
+            ))
+
+        return aiohttp.ClientSession(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    @contextlib.asynccontextmanager
+    async def _get_async(self, session, url, allow_redirects=True):
+        """
+        GET a Graph URL on an async session, retrying throttling and transient errors.
+
+        Mirrors the sync session's retry policy: responses with a status in
+        GRAPH_RETRY_STATUSES are retried up to GRAPH_MAX_RETRIES times, waiting
+        for Retry-After when given; the last response is handed back as-is.
+        """
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            async with session.get(url, allow_redirects=allow_redirects) as response:
+                if response.status not in GRAPH_RETRY_STATUSES or attempt == GRAPH_MAX_RETRIES:
+                    yield response
+                    return
+                delay = _retry_delay(response.headers.get('Retry-After'), attempt)
+
+            await asyncio.sleep(delay)
+
+    async def _iter_pages_async(self, session, url):
+        """Yield the items of each page of a Graph collection as it arrives."""
+        while url:
+            async with self._get_async(session, url) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+
+            yield data.get('value', [])
+
+            # Check for next page
+            url = data.get('@odata.nextLink')
+
+    async def _continue_pages_async(self, session, first_page, next_link):
+        """Yield an already fetched page, then the pages after it."""
+        yield first_page
+
+        if next_link:
+            async for page in self._iter_pages_async(session, next_link):
+                yield page
+
+    async def _resolve_download_urls_async(self, session, items, content_url, semaphore):
+        """
+        Resolve download URLs for image items that were listed without one.
+
+        Each item's /content endpoint answers with a redirect to the pre-authenticated
+        download URL; the redirects are requested concurrently instead of following them.
+
+        Args:
+            session: aiohttp session to issue the requests on
+            items: Raw driveItem dicts lacking a download URL annotation
+            content_url: Callable mapping an item ID to its /content URL
+            semaphore: The enumeration's request limiter, shared with its listings
+
+        Returns:
+            List of ImageItem objects for the items that could be resolved
+        """
+        async def resolve(item):
+            async with semaphore:
+                async with self._get_async(session, content_url(item['id']), allow_redirects=False) as response:
+                    if response.status not in _REDIRECT_STATUSES:
+                        response.raise_for_status()
+                        return None
+                    return response.headers.get('Location')
+
+        locations = await asyncio.gather(*(resolve(item) for item in items), return_exceptions=True)
+        return self._resolved_items(items, locations)
+
+    def _iter_children_async(self, session, drive_id, item_id):
+        """Async variant of iter_children yielding one page of items at a time."""
+        url = f"{self.base_url}/drives/{drive_id}/items/{item_id}/children?{_LIST_CHILDREN_QUERY}"
+        return self._iter_pages_async(session, url)
+
+    async def get_image_items_async(self, drive_id: str, item_id: str, recursive: bool = True) -> List[ImageItem]:
+        """
+        Get all image items from a OneDrive folder/album concurrently.
+
+        Sibling folders are listed in parallel over one aiohttp session, with at
+        most ENUMERATION_CONCURRENCY listings and download URL lookups in flight.
+
+        Args:
+            drive_id: The drive ID
+            item_id: The folder/album item ID
+            recursive: If True, recursively search subfolders
+
+        Returns:
+            List of ImageItem objects
+
+        Raises:
+            aiohttp.ClientResponseError: If API requests fail
+            httpx.HTTPStatusError: If API requests fail over HTTP/2
+        """
+        semaphore = asyncio.Semaphore(ENUMERATION_CONCURRENCY)
         image_items: List[ImageItem] = []
 
-        for item in children:
-            # Check if it's an image file
-            if is_image_file(item):
-                # Get download URL
-                download_url = item.get('@microsoft.graph.downloadUrl')
+        async with self._create_async_session() as session:
+            content_url = self._drive_content_url(drive_id)
+
+            async def walk(folder_id, prefix=''):
+                folders = [] if recursive else None
+                subfolders = []
+                missing_urls = []
+
+                async with semaphore:
+                    async for page in self._iter_children_async(session, drive_id, folder_id):
+                        _sort_children(page, image_items, folders, missing_urls, prefix)
+                        if folders:
+                            subfolders.extend(
+                                asyncio.create_task(walk(folder['id'], _folder_path(prefix, folder)))
+                                for folder in folders
+                            )
+                            folders.clear()
+
+                if missing_urls:
+                    image_items.extend(
+                        await self._resolve_download_urls_async(session, missing_urls, content_url, semaphore)
+                    )
+
+                if subfolders:
+                    await asyncio.gather(*subfolders)
 
-                if download_url:
-                    image_items.append(ImageItem(
-                        filename=item['name'],
-                        download_url=download_url,
-                        size=item.get('size', 0),
-                        mime_type=item.get('file', {}).get('mimeType', 'image/jpeg'),
-                    ))
+            await walk(item_id)
 
         return image_items
 
+    async def iter_shared_album_images(
+        self,
+        encoded_sharing_url: str,
+        recursive: bool = False,
+        first_page: Optional[List[Dict[str, Any]]] = None,
+        next_link: Optional[str] = None
+    ) -> AsyncIterator[ImageItem]:
+        """
+        Yield image items from a shared album as each page of results arrives.
+
+        This lets downloads start after the first page instead of waiting for
+        the whole album to be enumerated.
+
+        Args:
+            encoded_sharing_url: Encoded sharing URL (format: u!{base64url})
+            recursive: If True, recursively search subfolders. Subfolders are
+                       listed concurrently while the top level is still being
+                       paged; listings and download URL lookups share one
+                       limit of ENUMERATION_CONCURRENCY requests.
+            first_page: Already fetched top-level children (see
+                        get_album_info_and_first_page); listing then resumes
+                        from next_link instead of the first page
+            next_link: Continuation link for first_page, if any
+
+        Yields:
+            ImageItem objects
+
+        Raises:
+            aiohttp.ClientResponseError: If API requests fail
+            httpx.HTTPStatusError: If API requests fail over HTTP/2
+        """
+        semaphore = asyncio.Semaphore(ENUMERATION_CONCURRENCY)
+        folder_tasks = set()
+
+        async with self._create_async_session() as session:
+            content_url = self._shared_content_url(encoded_sharing_url)
+
+            async def list_folder(folder_id, prefix):
+                images = []
+                missing_urls = []
+                async with semaphore:
+                    url = self._shared_children_url(encoded_sharing_url, folder_id)
+                    async for page in self._iter_pages_async(session, url):
+                        collect(page, images, missing_urls, prefix)
+
+                # Outside the listing's slot: each lookup takes its own from the same limiter
+                return images + await resolve(missing_urls)
+
+            def collect(items, images, missing_urls, prefix=''):
+                folders = [] if recursive else None
+                _sort_children(items, images, folders, missing_urls, prefix)
+                if folders:
+                    folder_tasks.update(
+                        asyncio.create_task(list_folder(folder['id'], _folder_path(prefix, folder)))
+                        for folder in folders
+                    )
+
+            async def resolve(missing_urls):
+                if not missing_urls:
+                    return []
+                return await self._resolve_download_urls_async(session, missing_urls, content_url, semaphore)
+
+            try:
+                if first_page is None:
+                    pages = self._iter_pages_async(session, self._shared_children_url(encoded_sharing_url))
+                else:
+                    pages = self._continue_pages_async(session, first_page, next_link)
+
+                async for page in pages:
+                    images = []
+                    missing_urls = []
+                    collect(page, images, missing_urls)
+                    for image_item in images + await resolve(missing_urls):
+                        yield image_item
+
+                while folder_tasks:
+                    done, _ = await asyncio.wait(folder_tasks, return_when=asyncio.FIRST_COMPLETED)
+                    folder_tasks.difference_update(done)
+                    for task in done:
+                        for image_item in task.result():
+                            yield image_item
+            finally:
+                for task in folder_tasks:
+                    task.cancel()
+
+    async def get_shared_album_images_async(
+        self,
+        encoded_sharing_url: str,
+        recursive: bool = False,
+        first_page: Optional[List[Dict[str, Any]]] = None,
+        next_link: Optional[str] = None
+    ) -> List[ImageItem]:
+        """
+        Collect every image item of a shared album (see iter_shared_album_images).
+
+        Args:
+            encoded_sharing_url: Encoded sharing URL (format: u!{base64url})
+            recursive: If True, recursively search subfolders
+            first_page: Already fetched top-level children, if any
+            next_link: Continuation link for first_page, if any
+
+        Returns:
+            List of ImageItem objects
+
+        Raises:
+            aiohttp.ClientResponseError: If API requests fail
+            httpx.HTTPStatusError: If API requests fail over HTTP/2
+        """
+        return [
+            image_item
+            async for image_item in self.iter_shared_album_images(
+                encoded_sharing_url, recursive, first_page, next_link
+            )
+        ]
+
     def get_album_info(self, encoded_sharing_url):
         """
         Get information about an album (name, image count, etc.).
@@ -230,7 +1144,48 @@ class OneDriveAPIClient:
             requests.HTTPError: If API requests fail
         """
         shared_item = self.get_shared_item(encoded_sharing_url)
+        return self._album_info(shared_item, encoded_sharing_url)
 
+    def get_album_info_and_first_page(self, encoded_sharing_url):
+        """
+        Get album information and its first page of children in a single request.
+
+        Expanding the children of the shared item saves the separate round
+        trip that listing the album would otherwise start with. Pass the
+        returned page and link to get_shared_album_images or
+        iter_shared_album_images to continue from there.
+
+        The response bypasses the shared item caches of get_shared_item: its
+        children carry short-lived download URLs that must not be replayed
+        from a cache, and it is only requested once per run.
+
+        Args:
+            encoded_sharing_url: Encoded sharing URL
+
+        Returns:
+            Tuple of (album_info, first_page_items, next_link):
+            - album_info: Dict as returned by get_album_info
+            - first_page_items: List of child item dictionaries
+            - next_link: URL of the next page of children, or None
+
+        Raises:
+            requests.HTTPError: If API requests fail
+        """
+        url = (
+            f"{self.base_url}/shares/{encoded_sharing_url}/driveItem"
+            f"?$expand=children($select={LIST_CHILDREN_SELECT};$top={LIST_CHILDREN_PAGE_SIZE})"
+        )
+
+        response = self.session.get(url, timeout=self.timeout)
+        shared_item = self._parse_shared_item_response(response)
+
+        first_page = shared_item.pop('children', [])
+        next_link = shared_item.pop('children@odata.nextLink', None)
+
+        return self._album_info(shared_item, encoded_sharing_url), first_page, next_link
+
+    def _album_info(self, shared_item, encoded_sharing_url):
+        """Extract album information from a shared driveItem."""
         info = {
             'name': shared_item.get('name', 'Unknown Album'),
             'drive_id': shared_item['parentReference']['driveId'],
@@ -252,10 +1207,10 @@ class OneDriveAPIClient:
             True if connection is successful, False otherwise
         """
         try:
-            # Simple test request to /me/drive
+            # HEAD is enough to validate the token; the drive metadata body is not needed
             url = f"{self.base_url}/me/drive"
-            response = self.session.get(url, timeout=self.timeout)
-            return response.status_code == 200
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=False)
+            return response.status_code < 400
         except Exception:
             return False
 
@@ -6,6 +6,13 @@ from pathlib import Path
 from msal import PublicClientApplication, SerializableTokenCache
 from onedrive_downloader.config import TOKEN_CACHE_FILE, OAUTH_SCOPES
 
+# MSAL applications (and their token caches) reused within the process,
+# keyed by (client_id, authority)
+_msal_apps = {}
+
+# mtime of the token cache file when it was last loaded into each app's cache
+_cache_mtimes_ns = {}
+
 
 class OneDriveAuthenticator:
     """Handle OAuth 2.0 authentication for OneDrive/Microsoft Graph API."""
@@ -44,29 +51,52 @@ class OneDriveAuthenticator:
         # Use scopes from config or default
         self.scopes = self.config.get('scopes', OAUTH_SCOPES)
 
-        # Initialize token cache
-        self.cache = SerializableTokenCache()
-        self._load_token_cache()
+        # Reuse the MSAL application and its token cache if this process already
+        # built one for the same client, instead of re-initializing MSAL
+        self._app_key = (self.config['client_id'], self.config['authority'])
+        self.app = _msal_apps.get(self._app_key)
 
-        # Initialize MSAL application
-        self.app = PublicClientApplication(
-            client_id=self.config['client_id'],
-            authority=self.config['authority'],
-            token_cache=self.cache
-        )
+        if self.app is None:
+            self.app = PublicClientApplication(
+                client_id=self.config['client_id'],
+                authority=self.config['authority'],
+                token_cache=SerializableTokenCache()
+            )
+            _msal_apps[self._app_key] = self.app
+
+        self.cache = self.app.token_cache
+        self._load_token_cache()
 
     def _load_token_cache(self):
-        """Load token cache from file if it exists."""
-        cache_path = Path(TOKEN_CACHE_FILE)
-        if cache_path.exists():
-            with open(cache_path) as f:
-                self.cache.deserialize(f.read())
+        """Load token cache from file if it exists and changed since the last load."""
+        try:
+            mtime_ns = os.stat(TOKEN_CACHE_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        if mtime_ns == _cache_mtimes_ns.get(self._app_key):
+            return
+
+        with open(TOKEN_CACHE_FILE) as f:
+            self.cache.deserialize(f.read())
+        _cache_mtimes_ns[self._app_key] = mtime_ns
 
     def _save_token_cache(self):
-        """Save token cache to file."""
+        """
+        Save token cache to file.
+
+        The cache is written to a temporary file and moved into place so an
+        interrupted write can never leave a corrupt cache (which would force
+        the device code flow on the next run). The file is only readable by
+        the current user.
+        """
         if self.cache.has_state_changed:
-            with open(TOKEN_CACHE_FILE, 'w') as f:
+            tmp_path = TOKEN_CACHE_FILE + '.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
                 f.write(self.cache.serialize())
+            os.replace(tmp_path, TOKEN_CACHE_FILE)
+            _cache_mtimes_ns[self._app_key] = os.stat(TOKEN_CACHE_FILE).st_mtime_ns
 
     def _get_filtered_scopes(self):
         """Get scopes with reserved scopes filtered out (MSAL handles them automatically)."""
@@ -166,6 +196,11 @@ class OneDriveAuthenticator:
 
     def clear_cache(self):
         """Clear the token cache (forces re-authentication next time)."""
+        # Drop the shared in-memory app too, or later authenticators in this
+        # process would keep serving its cached tokens
+        _msal_apps.pop(self._app_key, None)
+        _cache_mtimes_ns.pop(self._app_key, None)
+
         cache_path = Path(TOKEN_CACHE_FILE)
         if cache_path.exists():
             cache_path.unlink()
@@ -1,24 +1,93 @@
 """Command-line interface for OneDrive Album Downloader."""
 
 import asyncio
+import json
+import os
 import sys
+import time
 import traceback
+from operator import attrgetter
 from pathlib import Path
 import click
-from tqdm import tqdm
 
 from onedrive_downloader import __version__
-from onedrive_downloader.auth import OneDriveAuthenticator
-from onedrive_downloader.api import OneDriveAPIClient
 from onedrive_downloader.parser import parse_and_encode_url
-from onedrive_downloader.downloader import ImageDownloader
+from onedrive_downloader.utils import format_size
 from onedrive_downloader.config import (
     DEFAULT_OUTPUT_DIR,
     DEFAULT_CONCURRENT_DOWNLOADS,
-    DEFAULT_MAX_RETRIES
+    DEFAULT_MAX_RETRIES,
+    DELTA_CACHE_FILE,
+    GRAPH_CACHE_FILE,
+    PROGRESS_REFRESH_SECONDS
 )
 
 
+def _delta_key(drive_id, item_id, output_path, recursive):
+    """
+    Key of the saved delta state for one album synced into one directory.
+
+    A delta link only stands for the files an earlier run wrote to that
+    directory with the same recursion setting, so both are part of the key.
+    """
+    scope = 'recursive' if recursive else 'top-level'
+    return f"{drive_id}/{item_id}|{Path(output_path).resolve()}|{scope}"
+
+
+def _has_files(output_path):
+    """Return True if an earlier run left anything in the album directory."""
+    try:
+        with os.scandir(output_path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+def _load_delta_cache():
+    """
+    Load saved delta state.
+
+    Format: {_delta_key(...): {"delta_link": str, "folder_paths": {folder_id: path}}}
+    """
+    try:
+        with open(DELTA_CACHE_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_delta_cache(delta_cache):
+    """Save delta links for the next incremental run."""
+    with open(DELTA_CACHE_FILE, 'w') as f:
+        json.dump(delta_cache, f, indent=2)
+
+
+def _report_skipped_items(client, verbose):
+    """Warn about images that were listed but had no download URL."""
+    if not client.skipped_items:
+        return
+
+    click.echo(
+        f"⚠️  {len(client.skipped_items)} image(s) skipped: no download URL available",
+        err=True
+    )
+    if verbose:
+        for name in client.skipped_items:
+            click.echo(f"  • {name}", err=True)
+
+
+async def _iterate(items):
+    """Expose an already enumerated list as an async iterable."""
+    for item in items:
+        yield item
+
+
+async def _download_stream(downloader, image_source, progress_callback, found_callback):
+    """Run the download pipeline, then release the downloader's connections."""
+    async with downloader:
+        return await downloader.download_stream(image_source, progress_callback, found_callback)
+
+
 @click.command()
 @click.version_option(version=__version__, prog_name="onedrive-downloader")
 @click.argument('album_url')
@@ -59,7 +128,12 @@ from onedrive_downloader.config import (
     is_flag=True,
     help='Show what would be downloaded without downloading'
 )
-def main(album_url, output, concurrent, retries, config, verbose, no_recursive, dry_run):
+@click.option(
+    '--incremental', '-i',
+    is_flag=True,
+    help='Only fetch images added or changed since the last incremental run'
+)
+def main(album_url, output, concurrent, retries, config, verbose, no_recursive, dry_run, incremental):
     """
     Download all images from a OneDrive album.
 
@@ -79,8 +153,19 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
 
         Dry run (preview only):
         $ python -m onedrive_downloader "https://1drv.ms/a/c/YOUR_ALBUM_ID" --dry-run
+
+        Incremental sync (only new or changed images after the first run):
+        $ python -m onedrive_downloader "https://1drv.ms/a/c/YOUR_ALBUM_ID" --incremental
     """
     try:
+        # Heavy dependencies (msal, requests, aiohttp) are imported only once there
+        # is work to do, so --help and --version return without loading them
+        from onedrive_downloader.api import OneDriveAPIClient, prewarm_dns
+        from onedrive_downloader.auth import OneDriveAuthenticator
+
+        # Resolve the Graph host while authentication runs
+        prewarm_dns()
+
         # Step 1: Authenticate
         click.echo("🔐 Authenticating with Microsoft...")
 
@@ -103,7 +188,11 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
         click.echo("✓ Authentication successful\n")
 
         # Step 2: Initialize API client
-        client = OneDriveAPIClient(access_token)
+        client = OneDriveAPIClient(access_token, cache_file=GRAPH_CACHE_FILE)
+        if verbose:
+            # Diagnostic only: keeps the extra round trip off the default path
+            connected = client.test_connection()
+            click.echo(f"Graph API connection: {'ok' if connected else 'failed'}")
 
         # Step 3: Parse and encode sharing URL
         if verbose:
@@ -120,8 +209,15 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
         # Step 4: Get shared item metadata
         click.echo("📂 Accessing album...")
 
+        first_page = None
+        next_link = None
+
         try:
-            album_info = client.get_album_info(encoded_url)
+            if incremental:
+                album_info = client.get_album_info(encoded_url)
+            else:
+                # Fetch the first page of children along with the album metadata
+                album_info, first_page, next_link = client.get_album_info_and_first_page(encoded_url)
             album_name = album_info['name']
             drive_id = album_info['drive_id']
             item_id = album_info['item_id']
@@ -132,37 +228,71 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
             sys.exit(1)
 
         click.echo(f"✓ Found album: {album_name}\n")
+        output_path = Path(output) / album_name
 
-        # Step 5: Get all image URLs
-        click.echo("🔍 Finding images...")
-
-        try:
-            image_items = client.get_shared_album_images(
-                encoded_url,
-                recursive=not no_recursive
-            )
-        except Exception as e:
-            click.echo(f"\n❌ Failed to enumerate images: {str(e)}", err=True)
-            if verbose:
-                traceback.print_exc()
-            sys.exit(1)
-
-        if not image_items:
-            click.echo("✓ No images found in album.")
-            sys.exit(0)
-
-        click.echo(f"✓ Found {len(image_items)} image(s)\n")
-
-        # Calculate total size
-        from onedrive_downloader.utils import format_size
-        total_size = sum(item.size for item in image_items)
-
-        if verbose or dry_run:
+        # Step 5: Incremental: only list what changed since the saved delta link
+        delta_cache = {}
+        delta_key = _delta_key(drive_id, item_id, output_path, not no_recursive)
+        delta_link = None
+        folder_paths = {}
+
+        if incremental:
+            click.echo("🔍 Finding new or changed images...")
+
+            try:
+                delta_cache = _load_delta_cache()
+
+                # Links saved without folder paths (older versions) start a full
+                # listing, which rebuilds the paths of subfolder images. So does
+                # a missing or emptied album directory: the files the link
+                # stands for are gone.
+                delta_state = delta_cache.get(delta_key)
+                if not isinstance(delta_state, dict) or not _has_files(output_path):
+                    delta_state = {}
+                folder_paths = delta_state.get('folder_paths', {})
+
+                image_items, delta_link = client.get_delta_image_items(
+                    drive_id,
+                    item_id,
+                    token=delta_state.get('delta_link'),
+                    recursive=not no_recursive,
+                    folder_paths=folder_paths
+                )
+            except Exception as e:
+                click.echo(f"\n❌ Failed to enumerate images: {str(e)}", err=True)
+                if verbose:
+                    traceback.print_exc()
+                sys.exit(1)
+
+        # Dry run: enumerate everything, show what would be downloaded and exit
+        if dry_run:
+            if not incremental:
+                click.echo("🔍 Finding images...")
+
+                try:
+                    image_items = asyncio.run(client.get_shared_album_images_async(
+                        encoded_url,
+                        recursive=not no_recursive,
+                        first_page=first_page,
+                        next_link=next_link
+                    ))
+                except Exception as e:
+                    click.echo(f"\n❌ Failed to enumerate images: {str(e)}", err=True)
+                    if verbose:
+                        traceback.print_exc()
+                    sys.exit(1)
+
+            _report_skipped_items(client, verbose)
+
+            if not image_items:
+                click.echo("✓ No images found in album.")
+                sys.exit(0)
+
+            click.echo(f"✓ Found {len(image_items)} image(s)\n")
+
+            total_size = sum(map(attrgetter('size'), image_items))
             click.echo(f"Total size: {format_size(total_size)}\n")
 
-        # Dry run: show what would be downloaded and exit
-        if dry_run:
-            output_path = Path(output) / album_name
             click.echo(f"📁 Would download to: {output_path}\n")
             click.echo("Files:")
             for item in image_items:
@@ -170,28 +300,69 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
             click.echo(f"\n✓ Dry run complete. {len(image_items)} file(s), {format_size(total_size)} total.")
             sys.exit(0)
 
-        # Step 6: Download images
-        output_path = Path(output) / album_name
+        # Step 6: Find and download images (downloads start while enumeration continues)
+        from tqdm import tqdm
+        from onedrive_downloader.downloader import ImageDownloader
+
         click.echo(f"⬇️  Downloading to: {output_path}")
 
-        # Create progress bar
+        # Create progress bar (total grows as images are found)
         progress_bar = tqdm(
-            total=len(image_items),
+            total=0,
             unit='image',
             desc='Downloading',
+            mininterval=PROGRESS_REFRESH_SECONDS,
             bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'
         )
 
+        # Counts are accumulated and the bar redrawn at most every
+        # PROGRESS_REFRESH_SECONDS, rather than once per found/finished image
+        found_count = 0
+        done_count = 0
+        last_refresh = 0.0
+
+        def refresh_progress(force=False):
+            nonlocal last_refresh
+            now = time.monotonic()
+            if force or now - last_refresh >= PROGRESS_REFRESH_SECONDS:
+                last_refresh = now
+                progress_bar.total = found_count
+                progress_bar.n = done_count
+                progress_bar.refresh()
+
+        # Found callback to grow the progress bar total
+        def on_found(item):
+            nonlocal found_count
+            found_count += 1
+            refresh_progress()
+
         # Progress callback to update progress bar
         def on_progress(result):
-            progress_bar.update(1)
+            nonlocal done_count
+            done_count += 1
+            refresh_progress()
             if verbose and not result.success:
                 tqdm.write(f"  ✗ Failed: {result.filename} - {result.error}")
 
-        # Run async download
+        if incremental:
+            image_source = _iterate(image_items)
+        else:
+            image_source = client.iter_shared_album_images(
+                encoded_url,
+                recursive=not no_recursive,
+                first_page=first_page,
+                next_link=next_link
+            )
+
+        # Run async enumeration + download pipeline
         try:
             downloader = ImageDownloader(output_path, concurrent, retries)
-            results = asyncio.run(downloader.download_all(image_items, on_progress))
+            results = asyncio.run(_download_stream(
+                downloader,
+                image_source,
+                on_progress,
+                on_found
+            ))
         except Exception as e:
             progress_bar.close()
             click.echo(f"\n❌ Download failed: {str(e)}", err=True)
@@ -199,8 +370,23 @@ def main(album_url, output, concurrent, retries, config, verbose, no_recursive,
                 traceback.print_exc()
             sys.exit(1)
         finally:
+            refresh_progress(force=True)
             progress_bar.close()
 
+        _report_skipped_items(client, verbose)
+
+        # Remember the delta position once everything up to it is on disk
+        if delta_link and not client.skipped_items and all(r.success for r in results):
+            delta_cache[delta_key] = {'delta_link': delta_link, 'folder_paths': folder_paths}
+            _save_delta_cache(delta_cache)
+
+        if not results:
+            if incremental:
+                click.echo("✓ No new or changed images.")
+            else:
+                click.echo("✓ No images found in album.")
+            sys.exit(0)
+
         # Step 7: Display summary
         stats = downloader.get_stats(results)
 
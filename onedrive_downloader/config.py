@@ -4,6 +4,7 @@ from onedrive_downloader import __version__
 
 # Microsoft Graph API
 GRAPH_API_ENDPOINT = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_MAX_REQUESTS = 20  # Maximum requests per JSON $batch call
 
 # Default settings
 DEFAULT_OUTPUT_DIR = "./downloads"
@@ -12,9 +13,45 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_TIMEOUT_SECONDS = 60
 DEFAULT_CHUNK_SIZE = 65536  # 64KB - optimized for download speed
 
+# Download retry backoff (full jitter): sleep uniform(0, min(MAX, BASE * 2**attempt))
+DOWNLOAD_RETRY_BASE_DELAY = 0.5
+DOWNLOAD_RETRY_MAX_DELAY = 30
+
+# Download connections: kept alive between images served by the same CDN host
+DOWNLOAD_KEEPALIVE_SECONDS = 30
+DNS_CACHE_TTL_SECONDS = 300
+
+# HTTP connection pooling (keeps TLS sessions to Graph warm between calls)
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = max(32, DEFAULT_CONCURRENT_DOWNLOADS * 2)
+
+# Children listings: only the fields needed to build ImageItems, in large pages.
+# @content.downloadUrl is the selectable alias of @microsoft.graph.downloadUrl.
+LIST_CHILDREN_SELECT = "id,name,size,file,folder,@content.downloadUrl"
+LIST_CHILDREN_PAGE_SIZE = 1000
+
+# Graph API retries on throttling (429) and transient server errors
+GRAPH_MAX_RETRIES = 6
+GRAPH_RETRY_BACKOFF_FACTOR = 0.5
+GRAPH_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Maximum folder listings in flight during async enumeration
+ENUMERATION_CONCURRENCY = 16
+
+# Minimum seconds between progress bar redraws
+PROGRESS_REFRESH_SECONDS = 0.25
+
 # Token cache
 TOKEN_CACHE_FILE = ".token_cache.json"
 
+# Shared item metadata cache
+SHARED_ITEM_CACHE_TTL_SECONDS = 300
+SHARED_ITEM_CACHE_MAX_ENTRIES = 32
+GRAPH_CACHE_FILE = ".graph_cache.db"
+
+# Delta links from previous incremental runs, keyed by "drive_id/item_id"
+DELTA_CACHE_FILE = ".delta_cache.json"
+
 # Supported image MIME types
 SUPPORTED_IMAGE_TYPES = [
     "image/jpeg",
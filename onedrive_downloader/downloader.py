@@ -1,18 +1,48 @@
 """Async image downloader with retry logic."""
 
 import asyncio
+import os
+import random
+import ssl
 import aiohttp
-import aiofiles
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import List, Callable, Optional, AsyncIterable
 from onedrive_downloader.config import (
     DEFAULT_MAX_RETRIES,
     DEFAULT_TIMEOUT_SECONDS,
     DEFAULT_CHUNK_SIZE,
+    DNS_CACHE_TTL_SECONDS,
+    DOWNLOAD_KEEPALIVE_SECONDS,
+    DOWNLOAD_RETRY_BASE_DELAY,
+    DOWNLOAD_RETRY_MAX_DELAY,
     USER_AGENT,
 )
 from onedrive_downloader.models import ImageItem
-from onedrive_downloader.utils import sanitize_filename, format_size
+from onedrive_downloader.utils import sanitize_relative_path, format_size
+
+
+# One TLS context for every download connection; building a context per
+# connector loads the CA store again. aiohttp speaks HTTP/1.1 only, so that
+# is the only protocol offered via ALPN.
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.set_alpn_protocols(['http/1.1'])
+
+
+# Hand control back to the event loop every this many chunks (1 MB), so a
+# download whose data is already buffered cannot starve the other workers
+_YIELD_EVERY_CHUNKS = 16
+
+
+def _backoff_delay(attempt):
+    """Full-jitter exponential backoff, so concurrent failures do not retry in lockstep."""
+    return random.uniform(0, min(DOWNLOAD_RETRY_MAX_DELAY, DOWNLOAD_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def _is_retryable(error):
+    """Return False for HTTP errors that another attempt cannot fix (4xx other than 429)."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return True
 
 
 class DownloadResult:
@@ -49,16 +79,87 @@ class ImageDownloader:
         self.max_retries = max_retries
         self.timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SECONDS)
 
+        # One keep-alive session for the downloader's lifetime: opened by
+        # 'async with' (inside the running event loop) and released by aclose().
+        # Without 'async with', each download_stream call opens and closes its own.
+        self._session = None
+
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Directories known to exist, so each album subfolder is created once
+        self._created_dirs = {self.output_dir}
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _get_session(self):
+        """Return the shared download session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrent,
+                limit_per_host=self.concurrent,
+                keepalive_timeout=DOWNLOAD_KEEPALIVE_SECONDS,
+                ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+                enable_cleanup_closed=True,
+                ssl=_SSL_CONTEXT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': USER_AGENT}
+            )
+        return self._session
+
+    def _ensure_parent(self, output_path):
+        """Create the directory an image is written to, once per directory."""
+        parent = output_path.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+
+    async def aclose(self):
+        """Close the shared download session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _skipped_result(self, safe_filename, output_path, expected_size, existing_sizes):
+        """Return a skipped DownloadResult if the file is already complete on disk, else None."""
+        if existing_sizes is None:
+            # One stat call answers both "does it exist" and "how big is it"
+            try:
+                file_size = os.stat(output_path).st_size
+            except FileNotFoundError:
+                return None
+        else:
+            file_size = existing_sizes.get(safe_filename)
+            if file_size is None:
+                return None
+
+        # Skip complete files; a size mismatch (e.g. a truncated file from an
+        # interrupted run) is downloaded again over the old file
+        if expected_size and file_size != expected_size:
+            return None
+
+        return DownloadResult(
+            filename=safe_filename,
+            success=True,
+            size=file_size,
+            skipped=True
+        )
+
     async def download_image(
         self,
         session,
         url,
         filename,
-        semaphore,
-        progress_callback=None
+        progress_callback=None,
+        expected_size=None,
+        existing_sizes=None
     ):
         """
         Download a single image with retry logic.
@@ -66,99 +167,140 @@ class ImageDownloader:
         Args:
             session: aiohttp ClientSession
             url: Download URL
-            filename: Filename to save as
-            semaphore: asyncio.Semaphore for rate limiting
+            filename: Filename to save as; may be a '/'-separated path relative
+                      to the output directory (images from album subfolders)
             progress_callback: Optional callback(result) to call on completion
+            expected_size: Size reported by OneDrive; an existing file is only
+                           skipped when it matches (None/0 skips any existing file)
+            existing_sizes: Optional {filename: size} snapshot of the output
+                            directory; the file is stat'ed individually otherwise
 
         Returns:
             DownloadResult
         """
-        # Sanitize filename
-        safe_filename = sanitize_filename(filename)
+        # Sanitize filename (each component of a relative path)
+        safe_filename = sanitize_relative_path(filename)
         output_path = self.output_dir / safe_filename
 
-        # Check if file already exists
-        if output_path.exists():
-            file_size = output_path.stat().st_size
-            result = DownloadResult(
-                filename=safe_filename,
-                success=True,
-                size=file_size,
-                skipped=True
-            )
+        result = self._skipped_result(safe_filename, output_path, expected_size, existing_sizes)
+        if result is not None:
             if progress_callback:
                 progress_callback(result)
             return result
 
+        # download_stream creates directories before queueing; a direct call
+        # creates the image's directory here
+        self._ensure_parent(output_path)
+        return await self._download(session, url, safe_filename, output_path, progress_callback)
+
+    async def _download(self, session, url, safe_filename, output_path, progress_callback=None):
+        """
+        Download an image that is not on disk yet into its (existing) directory.
+
+        Args:
+            session: aiohttp ClientSession
+            url: Download URL
+            safe_filename: Sanitized path relative to the output directory
+            output_path: Destination path; its parent directory must exist
+            progress_callback: Optional callback(result) to call on completion
+
+        Returns:
+            DownloadResult
+        """
+        # Download into a .partial file that only replaces output_path once it is
+        # complete, so an interrupted run never leaves a truncated image behind
+        partial_path = output_path.with_name(output_path.name + '.partial')
+
         # Download with retry logic
-        async with semaphore:
+        error_msg = "Unknown error"
+        success = False
+        try:
             for attempt in range(self.max_retries):
                 try:
                     async with session.get(url, timeout=self.timeout) as response:
                         response.raise_for_status()
 
-                        # Stream download to file
+                        # Stream download to file. Plain blocking writes of 64 KB chunks are
+                        # cheaper than handing each one to an executor thread. aiohttp has no
+                        # readinto(); iter_chunked() hands over the connection's own buffers
+                        # whenever they fit in a chunk. The buffered writer passes chunks
+                        # larger than its buffer straight to the OS without a copy, and it
+                        # retries short writes, so every chunk lands in full.
                         total_size = 0
-                        async with aiofiles.open(output_path, 'wb') as f:
+                        with open(partial_path, 'wb') as f:
+                            write = f.write
+                            chunks = 0
                             async for chunk in response.content.iter_chunked(DEFAULT_CHUNK_SIZE):
-                                await f.write(chunk)
+                                write(chunk)
                                 total_size += len(chunk)
+                                chunks += 1
+                                if chunks % _YIELD_EVERY_CHUNKS == 0:
+                                    await asyncio.sleep(0)
+
+                    os.replace(partial_path, output_path)
+                    success = True
+                    result = DownloadResult(
+                        filename=safe_filename,
+                        success=True,
+                        size=total_size
+                    )
+                    break
+
+                except (asyncio.TimeoutError, aiohttp.ClientError, OSError) as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        error_msg = f"Timeout (attempt {attempt + 1}/{self.max_retries})"
+                    else:
+                        error_msg = f"{type(e).__name__}: {str(e)}"
 
-                        result = DownloadResult(
-                            filename=safe_filename,
-                            success=True,
-                            size=total_size
-                        )
-
-                        if progress_callback:
-                            progress_callback(result)
-
-                        return result
+                    if attempt == self.max_retries - 1 or not _is_retryable(e):
+                        break
 
-                except asyncio.TimeoutError:
-                    error_msg = f"Timeout (attempt {attempt + 1}/{self.max_retries})"
-                    if attempt < self.max_retries - 1:
-                        # Exponential backoff
-                        await asyncio.sleep(2 ** attempt)
-                    else:
-                        result = DownloadResult(
-                            filename=safe_filename,
-                            success=False,
-                            error=error_msg
-                        )
-                        if progress_callback:
-                            progress_callback(result)
-                        return result
+                    # Exponential backoff
+                    await asyncio.sleep(_backoff_delay(attempt))
 
                 except Exception as e:
+                    # Anything else is not a transient network failure: fail this
+                    # file without retrying rather than aborting the whole run
                     error_msg = f"{type(e).__name__}: {str(e)}"
-                    if attempt < self.max_retries - 1:
-                        # Exponential backoff
-                        await asyncio.sleep(2 ** attempt)
-                    else:
-                        # Clean up partial download
-                        if output_path.exists():
-                            output_path.unlink()
-
-                        result = DownloadResult(
-                            filename=safe_filename,
-                            success=False,
-                            error=error_msg
-                        )
-                        if progress_callback:
-                            progress_callback(result)
-                        return result
-
-        # Should never reach here
-        result = DownloadResult(
-            filename=safe_filename,
-            success=False,
-            error="Unknown error"
-        )
+                    break
+        finally:
+            # Never leave a partial file behind, whether the last attempt failed,
+            # timed out or the task was cancelled
+            if not success:
+                partial_path.unlink(missing_ok=True)
+
+        if not success:
+            result = DownloadResult(
+                filename=safe_filename,
+                success=False,
+                error=error_msg
+            )
+
         if progress_callback:
             progress_callback(result)
         return result
 
+    def _existing_sizes(self):
+        """
+        Snapshot the sizes of files already in the output directory tree in one scan.
+
+        Returns:
+            {relative '/'-separated path: size}
+        """
+        sizes = {}
+        pending = [('', self.output_dir)]
+
+        while pending:
+            prefix, directory = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((f"{prefix}{entry.name}/", entry.path))
+                    elif entry.is_file():
+                        sizes[prefix + entry.name] = entry.stat().st_size
+
+        return sizes
+
     async def download_all(
         self,
         image_items: List[ImageItem],
@@ -172,32 +314,116 @@ class ImageDownloader:
             progress_callback: Optional callback(result) to call on each completion
 
         Returns:
-            List of DownloadResult objects
+            List of DownloadResult objects (in the order of image_items)
         """
-        # Create semaphore for rate limiting
-        semaphore = asyncio.Semaphore(self.concurrent)
-
-        # Create session with custom headers
-        connector = aiohttp.TCPConnector(limit=self.concurrent)
-        async with aiohttp.ClientSession(
-            connector=connector,
-            headers={'User-Agent': USER_AGENT}
-        ) as session:
-
-            # Create download tasks
-            tasks = []
+        async def produce():
             for item in image_items:
-                task = self.download_image(
-                    session,
-                    item.download_url,
-                    item.filename,
-                    semaphore,
-                    progress_callback
-                )
-                tasks.append(task)
-
-            # Run all downloads concurrently
-            results = await asyncio.gather(*tasks)
+                yield item
+
+        return await self.download_stream(produce(), progress_callback)
+
+    async def _worker(self, session, queue, results, progress_callback):
+        """
+        Download queued (index, item, safe_filename, output_path) entries until a
+        None sentinel arrives.
+
+        The producer has already settled skipped files and created each entry's
+        directory, so neither is repeated here.
+        """
+        download = self._download
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+            index, item, safe_filename, output_path = entry
+            results[index] = await download(
+                session,
+                item.download_url,
+                safe_filename,
+                output_path,
+                progress_callback
+            )
+
+    async def download_stream(
+        self,
+        image_items: AsyncIterable[ImageItem],
+        progress_callback: Optional[Callable[['DownloadResult'], None]] = None,
+        found_callback: Optional[Callable[[ImageItem], None]] = None
+    ) -> List['DownloadResult']:
+        """
+        Download images while they are still being enumerated.
+
+        Items from image_items are pushed onto a bounded queue consumed by
+        `concurrent` download workers, so downloads start as soon as the first
+        item is produced and only O(concurrent) downloads are ever scheduled.
+
+        Args:
+            image_items: Async iterable of ImageItem objects
+            progress_callback: Optional callback(result) to call on each completion
+            found_callback: Optional callback(item) to call when an item is queued
+
+        Returns:
+            List of DownloadResult objects (in enumeration order)
+        """
+        queue = asyncio.Queue(maxsize=self.concurrent * 2)
+        results = []
+        existing = self._existing_sizes()
+
+        # Outside 'async with' no session is open, and one created here must
+        # not outlive this call (or the event loop it is bound to)
+        owns_session = self._session is None or self._session.closed
+        session = self._get_session()
+
+        # The worker count is the concurrency limit
+        workers = [
+            asyncio.create_task(self._worker(session, queue, results, progress_callback))
+            for _ in range(self.concurrent)
+        ]
+
+        # Hoisted for the per-item loop
+        output_dir = self.output_dir
+        append_result = results.append
+        put = queue.put
+        skipped_result = self._skipped_result
+        ensure_parent = self._ensure_parent
+
+        async def produce():
+            async for item in image_items:
+                if found_callback:
+                    found_callback(item)
+
+                # Files already complete on disk are settled here, without
+                # waiting for (or occupying) a download worker
+                safe_filename = sanitize_relative_path(item.filename)
+                output_path = output_dir / safe_filename
+                skipped = skipped_result(safe_filename, output_path, item.size, existing)
+                append_result(skipped)
+                if skipped is not None:
+                    if progress_callback:
+                        progress_callback(skipped)
+                    continue
+
+                # Images from album subfolders keep their folder structure
+                ensure_parent(output_path)
+                await put((len(results) - 1, item, safe_filename, output_path))
+
+            # One sentinel per worker once enumeration is complete
+            for _ in workers:
+                await put(None)
+
+        # A dead worker would leave the producer blocked on the full queue, so
+        # the producer and the workers are awaited together and the first
+        # failure stops the whole run
+        tasks = [asyncio.create_task(produce()), *workers]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if owns_session:
+                await self.aclose()
 
         return results
 
@@ -219,12 +445,18 @@ class ImageDownloader:
                 'total_size_formatted': str
             }
         """
-        total = len(results)
-        successful = sum(1 for r in results if r.success)
-        skipped = sum(1 for r in results if r.skipped)
+        # Single pass over the results
+        total = successful = skipped = total_size = 0
+        for r in results:
+            total += 1
+            if r.success:
+                successful += 1
+                total_size += r.size
+            if r.skipped:
+                skipped += 1
+
         downloaded = successful - skipped
         failed = total - successful
-        total_size = sum(r.size for r in results if r.success)
 
         return {
             'total': total,
@@ -266,6 +498,6 @@ async def download_images(
         >>> successful = sum(1 for r in results if r.success)
         >>> print(f"Downloaded {successful}/{len(results)} images")
     """
-    downloader = ImageDownloader(output_dir, concurrent, max_retries)
-    results = await downloader.download_all(image_items, progress_callback)
+    async with ImageDownloader(output_dir, concurrent, max_retries) as downloader:
+        results = await downloader.download_all(image_items, progress_callback)
     return results
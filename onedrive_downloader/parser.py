@@ -1,8 +1,16 @@
 """Parser for OneDrive sharing URLs."""
 
+from functools import lru_cache
 from urllib.parse import urlparse
 from onedrive_downloader.utils import encode_sharing_url
 
+# Built once rather than per validate() call
+_VALID_HOSTS = frozenset((
+    'onedrive.live.com',
+    '1drv.ms',
+    'onedrive.com',
+))
+
 
 class OneDriveURLParser:
     """Parser for OneDrive album and sharing URLs."""
@@ -16,6 +24,7 @@ class OneDriveURLParser:
         """
         self.url = url
         self.parsed_url = urlparse(url)
+        self._encoded = None
 
     def validate(self):
         """
@@ -24,13 +33,7 @@ class OneDriveURLParser:
         Returns:
             True if valid, False otherwise
         """
-        valid_hosts = [
-            'onedrive.live.com',
-            '1drv.ms',
-            'onedrive.com',
-        ]
-
-        return self.parsed_url.netloc.lower() in valid_hosts
+        return self.parsed_url.netloc.lower() in _VALID_HOSTS
 
     def get_encoded_sharing_url(self):
         """
@@ -48,9 +51,13 @@ class OneDriveURLParser:
                 f"1drv.ms, or onedrive.com. Got: {self.parsed_url.netloc}"
             )
 
-        return encode_sharing_url(self.url)
+        if self._encoded is None:
+            self._encoded = encode_sharing_url(self.url)
+        return self._encoded
 
 
+# Album URLs are parsed again on retries and resumes; the result depends only on the URL
+@lru_cache(maxsize=256)
 def parse_and_encode_url(url):
     """
     Parse and encode a OneDrive URL for the Shares API.
@@ -1,9 +1,33 @@
 """Utility functions for OneDrive Album Downloader."""
 
+import os
 import re
-import base64
-from pathlib import Path
+from base64 import urlsafe_b64encode
 from urllib.parse import urlparse, parse_qs, unquote
+from onedrive_downloader.config import SUPPORTED_IMAGE_EXTENSIONS
+
+# Frozen for O(1) membership tests in is_image_file (called once per listed item)
+_IMAGE_EXTENSIONS = frozenset(SUPPORTED_IMAGE_EXTENSIONS)
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# MIME type fallback for get_image_extension, built once
+_MIME_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/bmp': '.bmp',
+    'image/tiff': '.tiff',
+    'image/heic': '.heic',
+    'image/heif': '.heif',
+}
+
+# Built once: sanitize_filename runs for every downloaded image, and a single
+# translate() pass replaces all invalid and control characters
+_INVALID_CHARS_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*' + ''.join(map(chr, range(32))), '_'))
+_ALBUM_ID_RE = re.compile(r'/album/([^/?]+)')
 
 
 def sanitize_filename(filename):
@@ -17,21 +41,38 @@ def sanitize_filename(filename):
         A sanitized filename safe for all platforms
     """
     # Remove or replace invalid characters
-    invalid_chars = r'[<>:"/\\|?*\x00-\x1f]'
-    sanitized = re.sub(invalid_chars, '_', filename)
+    sanitized = filename.translate(_INVALID_CHARS_TABLE)
 
     # Remove leading/trailing spaces and dots
     sanitized = sanitized.strip('. ')
 
     # Limit length to 255 characters (common filesystem limit)
     if len(sanitized) > 255:
-        name, ext = Path(sanitized).stem, Path(sanitized).suffix
+        name, ext = os.path.splitext(sanitized)
         max_name_length = 255 - len(ext)
         sanitized = name[:max_name_length] + ext
 
     return sanitized or 'unnamed'
 
 
+def sanitize_relative_path(path):
+    """
+    Sanitize a '/'-separated relative path, one component at a time.
+
+    Components are cleaned like filenames, so '..' and empty segments can
+    never escape or collapse the target directory.
+
+    Args:
+        path: Relative path such as 'Subfolder/photo.jpg'
+
+    Returns:
+        A sanitized relative path using '/' separators
+    """
+    if '/' not in path:
+        return sanitize_filename(path)
+    return '/'.join(map(sanitize_filename, path.split('/')))
+
+
 def encode_sharing_url(sharing_url):
     """
     Encode a OneDrive sharing URL for use with the Microsoft Graph Shares API.
@@ -52,17 +93,12 @@ def encode_sharing_url(sharing_url):
         >>> encode_sharing_url(url)
         'u!aHR0cHM6Ly9vbmVkcml2ZS5saXZlLmNvbS8_aWQ9Li4u'
     """
-    # Encode URL to bytes
-    url_bytes = sharing_url.encode('utf-8')
-
-    # Base64 URL-safe encode (replaces + with - and / with _)
-    encoded = base64.urlsafe_b64encode(url_bytes).decode('utf-8')
-
-    # Remove padding (=) as per Microsoft Graph API requirements
-    encoded = encoded.rstrip('=')
+    # Base64 URL-safe encode (replaces + with - and / with _) and remove the
+    # padding (=) as per Microsoft Graph API requirements, both on bytes
+    encoded = urlsafe_b64encode(sharing_url.encode('utf-8')).rstrip(b'=')
 
     # Add the required 'u!' prefix
-    return f'u!{encoded}'
+    return 'u!' + encoded.decode('ascii')
 
 
 def parse_album_id(album_url):
@@ -88,7 +124,7 @@ def parse_album_id(album_url):
         if 'photosData' in params:
             photos_data = unquote(params['photosData'][0])
             # Extract ID from path like /album/{ID}
-            match = re.search(r'/album/([^/?]+)', photos_data)
+            match = _ALBUM_ID_RE.search(photos_data)
             if match:
                 return match.group(1)
 
@@ -117,27 +153,15 @@ def get_image_extension(filename, mime_type=None):
     Returns:
         File extension with leading dot (e.g., '.jpg')
     """
-    # First try to get extension from filename
+    # First try to get extension from filename (a bare trailing dot doesn't count)
     if filename:
-        ext = Path(filename).suffix.lower()
-        if ext:
-            return ext
+        ext = os.path.splitext(filename)[1]
+        if len(ext) > 1:
+            return ext.lower()
 
     # Fallback to MIME type
-    mime_to_ext = {
-        'image/jpeg': '.jpg',
-        'image/jpg': '.jpg',
-        'image/png': '.png',
-        'image/gif': '.gif',
-        'image/webp': '.webp',
-        'image/bmp': '.bmp',
-        'image/tiff': '.tiff',
-        'image/heic': '.heic',
-        'image/heif': '.heif',
-    }
-
     if mime_type:
-        return mime_to_ext.get(mime_type.lower(), '.jpg')
+        return _MIME_EXTENSIONS.get(mime_type.lower(), '.jpg')
 
     # Default fallback
     return '.jpg'
@@ -153,22 +177,14 @@ def format_size(size_bytes):
     Returns:
         Formatted size string (e.g., "1.5 MB")
     """
-    if size_bytes == 0:
-        return "0 B"
-
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
-    size = float(size_bytes)
+    if size_bytes < 1024:
+        return f"{int(size_bytes)} B"
 
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
+    # Each unit is 2**10 times the previous one, so the bit length picks it directly
+    unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    size = size_bytes / (1 << (10 * unit_index))
 
-    # Format with appropriate decimal places
-    if unit_index == 0:
-        return f"{int(size)} {units[unit_index]}"
-    else:
-        return f"{size:.2f} {units[unit_index]}"
+    return f"{size:.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def is_image_file(item):
@@ -181,20 +197,19 @@ def is_image_file(item):
     Returns:
         True if the item is an image, False otherwise
     """
+    # Folders are never images, whatever their name
+    if 'folder' in item:
+        return False
+
     # Check if it has the 'image' facet
     if 'image' in item:
         return True
 
-    # Check MIME type
-    mime_type = item.get('file', {}).get('mimeType', '')
-    if mime_type.startswith('image/'):
+    # Check MIME type (no throwaway dict for items without a file facet)
+    file_facet = item.get('file')
+    if file_facet and file_facet.get('mimeType', '').startswith('image/'):
         return True
 
     # Check file extension
-    name = item.get('name', '')
-    ext = Path(name).suffix.lower()
-    from onedrive_downloader.config import SUPPORTED_IMAGE_EXTENSIONS
-    if ext in SUPPORTED_IMAGE_EXTENSIONS:
-        return True
-
-    return False
+    _, dot, ext = item.get('name', '').rpartition('.')
+    return bool(dot) and (dot + ext).lower() in _IMAGE_EXTENSIONS
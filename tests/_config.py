@@ -0,0 +1,20 @@
+"""Shared config.json loader for the manual Graph test scripts."""
+
+from functools import lru_cache
+from pathlib import Path
+
+import orjson
+
+# config.json lives at the repository root, whatever directory a script runs from
+CONFIG_PATH = Path(__file__).parent.parent / 'config.json'
+
+
+@lru_cache(maxsize=1)
+def get_config():
+    """
+    Load config.json once per process.
+
+    Returns:
+        The parsed config dict (shared; do not mutate)
+    """
+    return orjson.loads(CONFIG_PATH.read_bytes())
@@ -0,0 +1,39 @@
+"""Shared output helpers for the manual Graph test scripts."""
+
+import orjson
+
+
+def pp(obj):
+    """
+    Pretty-print a decoded JSON value with a two-space indent.
+
+    Args:
+        obj: JSON-compatible value
+
+    Returns:
+        Indented JSON string
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def dump_error(response):
+    """
+    Print the body of a failed Graph response.
+
+    The body is read once as bytes; it is only parsed as JSON when the
+    response says it is JSON.
+
+    Args:
+        response: requests.Response with a non-success status
+    """
+    body = response.content
+    print(f"Response Text: {body.decode(errors='replace')}")
+
+    if 'application/json' not in response.headers.get('Content-Type', ''):
+        return
+
+    try:
+        error_data = orjson.loads(body)
+    except ValueError:
+        return
+    print(f"\nError JSON: {pp(error_data)}")
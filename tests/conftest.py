@@ -0,0 +1,23 @@
+"""Shared pytest fixtures."""
+
+import socket
+import pytest
+
+
+def _network_blocked(*args, **kwargs):
+    raise RuntimeError("Unit tests must not access the network")
+
+
+@pytest.fixture(autouse=True)
+def block_network(request, monkeypatch):
+    """
+    Fail any *_unit test that tries to resolve a host or open a connection.
+
+    Only name resolution and connecting are blocked: asyncio still needs
+    socket.socketpair() for its event loop.
+    """
+    if request.node.path.name.endswith('_unit.py'):
+        monkeypatch.setattr(socket, 'getaddrinfo', _network_blocked)
+        monkeypatch.setattr(socket, 'create_connection', _network_blocked)
+        monkeypatch.setattr(socket.socket, 'connect', _network_blocked)
+        monkeypatch.setattr(socket.socket, 'connect_ex', _network_blocked)
@@ -7,10 +7,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import json
 import requests
 from onedrive_downloader.auth import get_authenticated_token
 from onedrive_downloader.parser import parse_and_encode_url
+from tests._output import dump_error, pp
 
 # Note: This test uses an old album view URL format (for testing failure cases)
 # For actual working tests, use test_share_link.py
@@ -31,13 +31,15 @@ print(f"Encoded URL: {encoded_url}\n")
 api_url = f"https://graph.microsoft.com/v1.0/shares/{encoded_url}/driveItem"
 print(f"API URL: {api_url}\n")
 
-headers = {
+# One session for every request so the Graph connection is reused
+SESSION = requests.Session()
+SESSION.headers.update({
     'Authorization': f'Bearer {token}',
-    'Content-Type': 'application/json'
-}
+    'Accept': 'application/json'
+})
 
 print("Making API request...")
-response = requests.get(api_url, headers=headers)
+response = SESSION.get(api_url)
 
 print(f"Status Code: {response.status_code}")
 print(f"Response Headers: {dict(response.headers)}\n")
@@ -45,12 +47,7 @@ print(f"Response Headers: {dict(response.headers)}\n")
 if response.status_code == 200:
     print("✓ SUCCESS!")
     data = response.json()
-    print(json.dumps(data, indent=2))
+    print(pp(data))
 else:
     print("✗ ERROR!")
-    print(f"Response Text: {response.text}")
-    try:
-        error_data = response.json()
-        print(f"\nError JSON: {json.dumps(error_data, indent=2)}")
-    except:
-        pass
+    dump_error(response)
@@ -0,0 +1,778 @@
+"""Unit tests for onedrive_downloader.api module."""
+
+import asyncio
+import orjson
+import pytest
+import requests
+from onedrive_downloader import api
+from onedrive_downloader.api import OneDriveAPIClient
+from onedrive_downloader.config import GRAPH_API_ENDPOINT, LIST_CHILDREN_PAGE_SIZE
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, data, status_code=200, headers=None):
+        self._data = data
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    @property
+    def content(self):
+        return orjson.dumps(self._data)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeBatchSession:
+    """Answers $batch POSTs from a {relative_url: body} mapping."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.batches = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        assert url == f"{GRAPH_API_ENDPOINT}/$batch"
+        # Listing query parameters are not part of the page keys
+        urls = [r['url'].replace(f"?{api._LIST_CHILDREN_QUERY}", '') for r in json['requests']]
+        self.batches.append(urls)
+        responses = [
+            {'id': r['id'], 'status': 200, 'body': self.pages[url]}
+            for r, url in zip(json['requests'], urls)
+        ]
+        return FakeResponse({'responses': responses})
+
+
+def make_client(session):
+    client = OneDriveAPIClient("token")
+    client.session = session
+    return client
+
+
+def image(name):
+    return {
+        'id': name,
+        'name': name,
+        'size': 10,
+        'file': {'mimeType': 'image/jpeg'},
+        '@microsoft.graph.downloadUrl': f"https://cdn.example.com/{name}",
+    }
+
+
+def folder(item_id):
+    return {'id': item_id, 'name': item_id, 'folder': {'childCount': 1}}
+
+
+class TestSessionRetries:
+    """Tests for the Graph session retry policy."""
+
+    def test_adapter_retries_throttling(self):
+        retry = OneDriveAPIClient("token").session.get_adapter(GRAPH_API_ENDPOINT).max_retries
+
+        assert 429 in retry.status_forcelist
+        assert retry.respect_retry_after_header
+        assert 'POST' in retry.allowed_methods
+
+    def test_backoff_has_bounded_jitter(self):
+        retry = OneDriveAPIClient("token").session.get_adapter(GRAPH_API_ENDPOINT).max_retries
+        retry = retry.increment(method='GET', url='/', error=requests.ConnectionError())
+        retry = retry.increment(method='GET', url='/', error=requests.ConnectionError())
+        base = api.Retry.get_backoff_time(retry)
+
+        delays = {retry.get_backoff_time() for _ in range(20)}
+        assert all(base <= delay <= base + retry.backoff_factor for delay in delays)
+        assert len(delays) > 1
+
+
+class TestSessionHeaders:
+    """Tests for the Graph session default headers."""
+
+    def test_content_type_is_not_a_session_default(self):
+        headers = OneDriveAPIClient("token").session.headers
+
+        assert 'Content-Type' not in headers
+        assert headers['Accept'] == 'application/json;odata.metadata=minimal'
+
+    def test_requests_maximum_page_size(self):
+        headers = OneDriveAPIClient("token").session.headers
+
+        assert headers['Prefer'] == f'odata.maxpagesize={LIST_CHILDREN_PAGE_SIZE}'
+
+
+class TestWarmUp:
+    """Tests for background DNS warm-up."""
+
+    def test_prewarm_dns_resolves_graph_host(self, monkeypatch):
+        resolved = []
+        monkeypatch.setattr(api.socket, 'getaddrinfo', lambda host, port: resolved.append((host, port)))
+
+        api.prewarm_dns().join()
+
+        assert resolved == [('graph.microsoft.com', 443)]
+
+
+class TestConnection:
+    """Tests for test_connection."""
+
+    @pytest.mark.parametrize("status, expected", [(200, True), (302, True), (401, False)])
+    def test_uses_head_status(self, status, expected):
+        class HeadSession:
+            def head(self, url, timeout=None, allow_redirects=True):
+                assert allow_redirects is False
+                return FakeResponse(None, status_code=status)
+
+        assert make_client(HeadSession()).test_connection() is expected
+
+
+class TestToImageItem:
+    """Tests for driveItem to ImageItem conversion."""
+
+    def test_reads_selected_download_url_alias(self):
+        item = {'name': 'a.jpg', 'size': 5, '@content.downloadUrl': 'https://cdn.example.com/a.jpg'}
+        assert api._to_image_item(item).download_url == 'https://cdn.example.com/a.jpg'
+
+    def test_falls_back_to_graph_annotation(self):
+        assert api._to_image_item(image('a.jpg')).download_url == 'https://cdn.example.com/a.jpg'
+
+    def test_missing_download_url(self):
+        assert api._to_image_item({'name': 'a.jpg'}) is None
+
+
+class TestSortChildren:
+    """Tests for the shared child-sorting helper."""
+
+    def test_sorts_images_folders_and_missing_urls(self):
+        no_url = {'id': 'b', 'name': 'b.jpg', 'file': {'mimeType': 'image/jpeg'}}
+        images, folders, missing_urls = [], [], []
+
+        api._sort_children(
+            [image('a.jpg'), folder('f1'), no_url, {'name': 'doc.pdf'}], images, folders, missing_urls
+        )
+
+        assert [item.filename for item in images] == ['a.jpg']
+        assert folders == [folder('f1')]
+        assert missing_urls == [no_url]
+
+    def test_folders_and_missing_urls_are_optional(self):
+        images = []
+        api._sort_children([folder('f1'), {'name': 'b.jpg'}], images)
+
+        assert images == []
+
+
+class TestGetImageItems:
+    """Tests for breadth-first batched enumeration."""
+
+    def test_walks_subfolders_level_by_level(self):
+        session = FakeBatchSession({
+            '/drives/d/items/root/children': {'value': [image('a.jpg'), folder('f1'), folder('f2')]},
+            '/drives/d/items/f1/children': {'value': [image('b.jpg'), folder('f3')]},
+            '/drives/d/items/f2/children': {'value': [image('c.jpg')]},
+            '/drives/d/items/f3/children': {'value': [image('d.jpg')]},
+        })
+        items = make_client(session).get_image_items('d', 'root')
+
+        assert sorted(item.filename for item in items) == ['a.jpg', 'f1/b.jpg', 'f1/f3/d.jpg', 'f2/c.jpg']
+        # One batch per folder depth
+        assert len(session.batches) == 3
+        assert session.batches[1] == ['/drives/d/items/f1/children', '/drives/d/items/f2/children']
+
+    def test_follows_next_links(self):
+        next_link = f"{GRAPH_API_ENDPOINT}/drives/d/items/root/children?$skiptoken=2"
+        session = FakeBatchSession({
+            '/drives/d/items/root/children': {'value': [image('a.jpg')], '@odata.nextLink': next_link},
+            '/drives/d/items/root/children?$skiptoken=2': {'value': [image('b.jpg')]},
+        })
+        items = make_client(session).get_image_items('d', 'root')
+
+        assert [item.filename for item in items] == ['a.jpg', 'b.jpg']
+
+    def test_non_recursive_skips_subfolders(self):
+        session = FakeBatchSession({
+            '/drives/d/items/root/children': {'value': [image('a.jpg'), folder('f1')]},
+        })
+        items = make_client(session).get_image_items('d', 'root', recursive=False)
+
+        assert [item.filename for item in items] == ['a.jpg']
+        assert len(session.batches) == 1
+
+    def test_splits_large_levels_into_batches_of_twenty(self):
+        pages = {'/drives/d/items/root/children': {'value': [folder(f"f{i}") for i in range(25)]}}
+        for i in range(25):
+            pages[f'/drives/d/items/f{i}/children'] = {'value': []}
+        session = FakeBatchSession(pages)
+        make_client(session).get_image_items('d', 'root')
+
+        assert [len(batch) for batch in session.batches] == [1, 20, 5]
+
+
+class TestGetImageItemsAsync:
+    """Tests for concurrent aiohttp enumeration."""
+
+    def test_walks_subfolders_concurrently(self):
+        tree = {
+            'root': [image('a.jpg'), folder('f1'), folder('f2')],
+            'f1': [image('b.jpg'), folder('f3')],
+            'f2': [image('c.jpg')],
+            'f3': [image('d.jpg')],
+        }
+        client = OneDriveAPIClient("token")
+
+        async def fake_iter_children(session, drive_id, item_id):
+            await asyncio.sleep(0)
+            yield tree[item_id]
+
+        client._iter_children_async = fake_iter_children
+        items = asyncio.run(client.get_image_items_async('d', 'root'))
+
+        assert sorted(item.filename for item in items) == ['a.jpg', 'f1/b.jpg', 'f1/f3/d.jpg', 'f2/c.jpg']
+
+    def test_non_recursive_skips_subfolders(self):
+        client = OneDriveAPIClient("token")
+        visited = []
+
+        async def fake_iter_children(session, drive_id, item_id):
+            visited.append(item_id)
+            yield [image('a.jpg'), folder('f1')]
+
+        client._iter_children_async = fake_iter_children
+        items = asyncio.run(client.get_image_items_async('d', 'root', recursive=False))
+
+        assert [item.filename for item in items] == ['a.jpg']
+        assert visited == ['root']
+
+    def test_resolves_missing_download_urls_through_content_redirect(self):
+        client = OneDriveAPIClient("token")
+        no_url = {key: value for key, value in image('b.jpg').items() if 'downloadUrl' not in key}
+        requested = []
+
+        async def fake_iter_children(session, drive_id, item_id):
+            yield [image('a.jpg'), no_url, dict(no_url, id='c.jpg', name='c.jpg')]
+
+        class FakeRedirect:
+            def __init__(self, url):
+                self.status = 302 if url.endswith('/b.jpg/content') else 404
+                self.headers = {'Location': 'https://cdn.example.com/resolved-b.jpg'}
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def raise_for_status(self):
+                raise RuntimeError(f"HTTP {self.status}")
+
+        class FakeAsyncSession:
+            def get(self, url, allow_redirects=True):
+                assert allow_redirects is False
+                requested.append(url)
+                return FakeRedirect(url)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        client._iter_children_async = fake_iter_children
+        client._create_async_session = FakeAsyncSession
+        items = asyncio.run(client.get_image_items_async('d', 'root'))
+
+        assert {item.filename: item.download_url for item in items} == {
+            'a.jpg': 'https://cdn.example.com/a.jpg',
+            'b.jpg': 'https://cdn.example.com/resolved-b.jpg',
+        }
+        assert sorted(requested) == [
+            f"{GRAPH_API_ENDPOINT}/drives/d/items/b.jpg/content",
+            f"{GRAPH_API_ENDPOINT}/drives/d/items/c.jpg/content",
+        ]
+        assert client.skipped_items == ['c.jpg']
+
+    def test_listings_and_lookups_share_one_limit(self, monkeypatch):
+        monkeypatch.setattr(api, 'ENUMERATION_CONCURRENCY', 2)
+        client = OneDriveAPIClient("token")
+        in_flight = 0
+        peak = 0
+
+        def no_url(name):
+            return {key: value for key, value in image(name).items() if 'downloadUrl' not in key}
+
+        async def fake_iter_children(session, drive_id, item_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            if item_id == 'root':
+                yield [folder(f"f{i}") for i in range(4)]
+            else:
+                yield [no_url(f"{item_id}-{i}.jpg") for i in range(4)]
+
+        class FakeRedirect:
+            status = 302
+            headers = {'Location': 'https://cdn.example.com/resolved'}
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.001)
+                return self
+
+            async def __aexit__(self, *exc):
+                nonlocal in_flight
+                in_flight -= 1
+                return False
+
+        class FakeAsyncSession:
+            def get(self, url, allow_redirects=True):
+                return FakeRedirect()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        client._iter_children_async = fake_iter_children
+        client._create_async_session = FakeAsyncSession
+        items = asyncio.run(client.get_image_items_async('d', 'root'))
+
+        assert len(items) == 16
+        assert peak == 2
+
+
+class TestAsyncSession:
+    """Tests for the async enumeration session."""
+
+    def test_falls_back_to_aiohttp_without_httpx(self, monkeypatch):
+        monkeypatch.setattr(api, 'httpx', None)
+
+        async def create():
+            async with OneDriveAPIClient("token")._create_async_session() as session:
+                return type(session)
+
+        assert asyncio.run(create()) is api.aiohttp.ClientSession
+
+    def test_http2_session_adapts_httpx_responses(self):
+        class FakeHTTPXResponse:
+            status_code = 302
+            headers = {'Location': 'https://cdn.example.com/a.jpg'}
+            content = b'{}'
+
+            def raise_for_status(self):
+                pass
+
+        class FakeHTTPXClient:
+            closed = False
+
+            async def get(self, url, follow_redirects=True):
+                assert follow_redirects is False
+                return FakeHTTPXResponse()
+
+            async def aclose(self):
+                FakeHTTPXClient.closed = True
+
+        async def fetch():
+            async with api._HTTP2Session(FakeHTTPXClient()) as session:
+                async with session.get('https://graph', allow_redirects=False) as response:
+                    return response.status, response.headers['Location'], await response.read()
+
+        assert asyncio.run(fetch()) == (302, 'https://cdn.example.com/a.jpg', b'{}')
+        assert FakeHTTPXClient.closed
+
+
+class TestBatchListChildren:
+    """Tests for batch_list_children."""
+
+    def test_failed_sub_request_raises(self):
+        class FailingSession:
+            def post(self, url, json=None, headers=None, timeout=None):
+                return FakeResponse({'responses': [
+                    {'id': '0', 'status': 404, 'body': {'error': {'message': 'Item not found'}}}
+                ]})
+
+        with pytest.raises(requests.HTTPError) as exc_info:
+            make_client(FailingSession()).batch_list_children([('d', 'missing')])
+        assert "Item not found" in str(exc_info.value)
+
+    def test_throttled_sub_requests_are_resent(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(api.time, 'sleep', delays.append)
+
+        class ThrottlingSession:
+            def __init__(self):
+                self.batches = []
+
+            def post(self, url, json=None, headers=None, timeout=None):
+                ids = [r['id'] for r in json['requests']]
+                self.batches.append(ids)
+                responses = []
+                for sub_request in json['requests']:
+                    if sub_request['id'] == '1' and len(self.batches) == 1:
+                        responses.append({'id': '1', 'status': 429, 'headers': {'Retry-After': '7'}})
+                    else:
+                        responses.append({'id': sub_request['id'], 'status': 200, 'body': {'value': [image('a.jpg')]}})
+                return FakeResponse({'responses': responses})
+
+        session = ThrottlingSession()
+        children, _ = make_client(session).batch_list_children([('d', 'f0'), ('d', 'f1')])
+
+        assert session.batches == [['0', '1'], ['1']]
+        assert delays == [7.0]
+        assert len(children) == 2
+
+
+class FakeThrottledResponse:
+    """aiohttp-style response for async retry tests."""
+
+    def __init__(self, status, data=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return orjson.dumps(self._data)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+
+class TestAsyncRetries:
+    """Tests for throttling retries on the async enumeration paths."""
+
+    def test_pages_retry_throttling_with_retry_after(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(api.asyncio, 'sleep', fake_sleep)
+        responses = [
+            FakeThrottledResponse(429, headers={'Retry-After': '3'}),
+            FakeThrottledResponse(503),
+            FakeThrottledResponse(200, {'value': [image('a.jpg')]}),
+        ]
+
+        class Session:
+            def get(self, url, allow_redirects=True):
+                return responses.pop(0)
+
+        async def pages():
+            return [page async for page in OneDriveAPIClient("token")._iter_pages_async(Session(), 'u')]
+
+        assert asyncio.run(pages()) == [[image('a.jpg')]]
+        assert delays[0] == 3.0
+        assert 0 < delays[1] <= 2 * api.GRAPH_RETRY_BACKOFF_FACTOR + api.GRAPH_RETRY_BACKOFF_FACTOR
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        async def fake_sleep(delay):
+            pass
+
+        monkeypatch.setattr(api.asyncio, 'sleep', fake_sleep)
+        requested = []
+
+        class Session:
+            def get(self, url, allow_redirects=True):
+                requested.append(url)
+                return FakeThrottledResponse(429)
+
+        async def pages():
+            return [page async for page in OneDriveAPIClient("token")._iter_pages_async(Session(), 'u')]
+
+        with pytest.raises(RuntimeError, match="HTTP 429"):
+            asyncio.run(pages())
+        assert len(requested) == api.GRAPH_MAX_RETRIES + 1
+
+
+class FakeGetSession:
+    """Replays queued responses for GET requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        return self.responses.pop(0)
+
+
+class TestGetSharedItem:
+    """Tests for shared item caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        api._shared_item_cache.clear()
+        yield
+        api._shared_item_cache.clear()
+
+    def test_memoizes_within_ttl(self):
+        session = FakeGetSession(FakeResponse({'id': 'album'}))
+        client = make_client(session)
+
+        assert client.get_shared_item('u!abc') == {'id': 'album'}
+        assert client.get_shared_item('u!abc') == {'id': 'album'}
+        assert len(session.requests) == 1
+
+    def test_cache_is_per_token(self):
+        session = FakeGetSession(FakeResponse({'id': 'one'}), FakeResponse({'id': 'two'}))
+        make_client(session).get_shared_item('u!abc')
+
+        other = OneDriveAPIClient("other-token")
+        other.session = session
+        assert other.get_shared_item('u!abc') == {'id': 'two'}
+
+    def test_disk_cache_revalidates_with_etag(self, tmp_path):
+        cache_file = str(tmp_path / 'graph_cache')
+        session = FakeGetSession(
+            FakeResponse({'id': 'album'}, headers={'ETag': '"v1"'}),
+            FakeResponse(None, status_code=304),
+        )
+        first = OneDriveAPIClient("token", cache_file=cache_file)
+        first.session = session
+        first.get_shared_item('u!abc')
+
+        api._shared_item_cache.clear()
+        second = OneDriveAPIClient("token", cache_file=cache_file)
+        second.session = session
+
+        assert second.get_shared_item('u!abc') == {'id': 'album'}
+        assert session.requests[1][1] == {'If-None-Match': '"v1"'}
+
+    def test_unreadable_disk_cache_falls_back_to_plain_get(self, tmp_path, caplog):
+        cache_file = tmp_path / 'graph_cache'
+        cache_file.write_bytes(b'not a database')
+        session = FakeGetSession(FakeResponse({'id': 'album'}, headers={'ETag': '"v1"'}))
+        client = OneDriveAPIClient("token", cache_file=str(cache_file))
+        client.session = session
+
+        assert client.get_shared_item('u!abc') == {'id': 'album'}
+        assert session.requests[0][1] == {}
+        assert "Graph cache" in caplog.text
+
+    def test_unwritable_disk_cache_is_skipped(self, tmp_path):
+        session = FakeGetSession(FakeResponse({'id': 'album'}, headers={'ETag': '"v1"'}))
+        client = OneDriveAPIClient("token", cache_file=str(tmp_path / 'missing' / 'graph_cache'))
+        client.session = session
+
+        assert client.get_shared_item('u!abc') == {'id': 'album'}
+
+
+class TestDelta:
+    """Tests for delta enumeration."""
+
+    def test_follows_pages_to_delta_link(self):
+        session = FakeGetSession(
+            FakeResponse({'value': [image('a.jpg')], '@odata.nextLink': 'https://next'}),
+            FakeResponse({'value': [image('b.jpg')], '@odata.deltaLink': 'https://delta?token=1'}),
+        )
+        items, delta_link = make_client(session).delta_children('d', 'root')
+
+        assert [item['name'] for item in items] == ['a.jpg', 'b.jpg']
+        assert delta_link == 'https://delta?token=1'
+        assert session.requests[0][0] == f"{GRAPH_API_ENDPOINT}/drives/d/items/root/delta"
+
+    def test_resumes_from_token(self):
+        session = FakeGetSession(FakeResponse({'value': [], '@odata.deltaLink': 'https://delta?token=2'}))
+        make_client(session).delta_children('d', 'root', token='https://delta?token=1')
+
+        assert session.requests[0][0] == 'https://delta?token=1'
+
+    def test_expired_token_restarts_full_listing(self):
+        session = FakeGetSession(
+            FakeResponse({}, status_code=410),
+            FakeResponse({'value': [image('a.jpg')], '@odata.deltaLink': 'https://delta?token=3'}),
+        )
+        items, delta_link = make_client(session).delta_children('d', 'root', token='https://old')
+
+        assert len(items) == 1
+        assert delta_link == 'https://delta?token=3'
+
+    def test_folder_paths_carry_over_to_later_deltas(self):
+        sub = dict(folder('sub'), parentReference={'id': 'root'})
+        deeper = dict(folder('deeper'), parentReference={'id': 'sub'})
+        session = FakeGetSession(
+            FakeResponse({'value': [sub, deeper], '@odata.deltaLink': 'x'}),
+            # A later delta only returns the changed image, not its folders
+            FakeResponse({'value': [dict(image('new.jpg'), parentReference={'id': 'deeper'})], '@odata.deltaLink': 'y'}),
+        )
+        client = make_client(session)
+        folder_paths = {}
+
+        client.get_delta_image_items('d', 'root', folder_paths=folder_paths)
+        items, _ = client.get_delta_image_items('d', 'root', token='x', folder_paths=folder_paths)
+
+        assert folder_paths['deeper'] == 'sub/deeper/'
+        assert [item.filename for item in items] == ['sub/deeper/new.jpg']
+
+    def test_image_items_skip_deleted_and_folders(self):
+        deleted = dict(image('gone.jpg'), deleted={'state': 'deleted'})
+        nested = dict(image('nested.jpg'), parentReference={'id': 'sub'})
+        top = dict(image('top.jpg'), parentReference={'id': 'root'})
+        session = FakeGetSession(
+            FakeResponse({'value': [folder('sub'), deleted, nested, top], '@odata.deltaLink': 'x'}),
+            FakeResponse({'value': [folder('sub'), deleted, nested, top], '@odata.deltaLink': 'x'}),
+        )
+        client = make_client(session)
+
+        items, _ = client.get_delta_image_items('d', 'root')
+        assert [item.filename for item in items] == ['sub/nested.jpg', 'top.jpg']
+
+        items, _ = client.get_delta_image_items('d', 'root', recursive=False)
+        assert [item.filename for item in items] == ['top.jpg']
+
+
+class TestSyncDownloadUrlLookup:
+    """Tests for resolving missing download URLs on the sync enumeration paths."""
+
+    def test_delta_items_are_resolved_through_content_redirect(self):
+        no_url = {key: value for key, value in image('b.jpg').items() if 'downloadUrl' not in key}
+        gone = dict(no_url, id='c.jpg', name='c.jpg')
+
+        class DeltaSession:
+            def __init__(self):
+                self.lookups = []
+
+            def get(self, url, headers=None, timeout=None, allow_redirects=True):
+                if url.endswith('/delta'):
+                    return FakeResponse({'value': [image('a.jpg'), no_url, gone], '@odata.deltaLink': 'x'})
+                assert allow_redirects is False
+                self.lookups.append(url)
+                if url.endswith('/b.jpg/content'):
+                    return FakeResponse(None, status_code=302, headers={'Location': 'https://cdn.example.com/b'})
+                return FakeResponse(None, status_code=404)
+
+        session = DeltaSession()
+        client = make_client(session)
+        items, _ = client.get_delta_image_items('d', 'root')
+
+        assert {item.filename: item.download_url for item in items} == {
+            'a.jpg': 'https://cdn.example.com/a.jpg',
+            'b.jpg': 'https://cdn.example.com/b',
+        }
+        assert sorted(session.lookups) == [
+            f"{GRAPH_API_ENDPOINT}/drives/d/items/b.jpg/content",
+            f"{GRAPH_API_ENDPOINT}/drives/d/items/c.jpg/content",
+        ]
+        assert client.skipped_items == ['c.jpg']
+
+
+class FakeListingSession:
+    """Answers children listings from a {path or absolute URL: items} mapping."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, headers=None, timeout=None):
+        if url in self.pages:
+            return FakeResponse({'value': self.pages[url]})
+        path = url[len(GRAPH_API_ENDPOINT):].split('?')[0]
+        return FakeResponse({'value': self.pages[path]})
+
+
+def make_pages_client(pages):
+    """Client whose async listings answer from a {path or absolute URL: items} mapping."""
+    client = OneDriveAPIClient("token")
+
+    async def fake_iter_pages(session, url):
+        if url not in pages:
+            url = url[len(GRAPH_API_ENDPOINT):].split('?')[0]
+        yield pages[url]
+
+    client._iter_pages_async = fake_iter_pages
+    return client
+
+
+class TestIterChildren:
+    """Tests for generator-based listings."""
+
+    def test_list_children_wraps_iterator(self):
+        session = FakeListingSession({'/drives/d/items/root/children': [image('a.jpg'), folder('f1')]})
+        client = make_client(session)
+
+        assert [item['id'] for item in client.iter_children('d', 'root')] == ['a.jpg', 'f1']
+        assert client.list_children('d', 'root') == list(client.iter_children('d', 'root'))
+
+
+class TestSharedAlbumImages:
+    """Tests for recursive Shares API enumeration."""
+
+    PAGES = {
+        '/shares/u!abc/driveItem/children': [image('a.jpg'), folder('f1')],
+        '/shares/u!abc/items/f1/children': [image('b.jpg'), folder('f2')],
+        '/shares/u!abc/items/f2/children': [image('c.jpg')],
+    }
+
+    def test_recursive_lists_subfolders_through_shares(self):
+        client = make_pages_client(self.PAGES)
+        items = client.get_shared_album_images('u!abc', recursive=True)
+
+        assert sorted(item.filename for item in items) == ['a.jpg', 'f1/b.jpg', 'f1/f2/c.jpg']
+
+    def test_same_names_in_different_folders_stay_distinct(self):
+        client = make_pages_client({
+            '/shares/u!abc/driveItem/children': [image('IMG_0001.jpg'), folder('f1')],
+            '/shares/u!abc/items/f1/children': [image('IMG_0001.jpg')],
+        })
+        items = client.get_shared_album_images('u!abc', recursive=True)
+
+        assert sorted(item.filename for item in items) == ['IMG_0001.jpg', 'f1/IMG_0001.jpg']
+
+    def test_non_recursive_lists_top_level_only(self):
+        client = make_pages_client(self.PAGES)
+        items = client.get_shared_album_images('u!abc')
+
+        assert [item.filename for item in items] == ['a.jpg']
+
+    def test_async_iterator_recurses(self):
+        client = make_pages_client(self.PAGES)
+
+        async def collect(recursive):
+            return [item.filename async for item in client.iter_shared_album_images('u!abc', recursive)]
+
+        assert sorted(asyncio.run(collect(True))) == ['a.jpg', 'f1/b.jpg', 'f1/f2/c.jpg']
+        assert asyncio.run(collect(False)) == ['a.jpg']
+
+
+class TestAlbumInfoAndFirstPage:
+    """Tests for fetching album metadata together with its first children page."""
+
+    def test_returns_info_first_page_and_next_link(self):
+        shared_item = {
+            'id': 'album',
+            'name': 'Holidays',
+            'parentReference': {'driveId': 'd'},
+            'folder': {'childCount': 3},
+            'children': [image('a.jpg')],
+            'children@odata.nextLink': 'https://next',
+        }
+        session = FakeGetSession(FakeResponse(shared_item))
+        info, first_page, next_link = make_client(session).get_album_info_and_first_page('u!abc')
+
+        assert info['name'] == 'Holidays'
+        assert info['item_count'] == 3
+        assert first_page == [image('a.jpg')]
+        assert next_link == 'https://next'
+        assert '$expand=children' in session.requests[0][0]
+        assert f';$top={LIST_CHILDREN_PAGE_SIZE})' in session.requests[0][0]
+
+    def test_listing_resumes_from_first_page(self):
+        client = make_pages_client({
+            'https://next': [image('b.jpg'), folder('f1')],
+            '/shares/u!abc/items/f1/children': [image('c.jpg')],
+        })
+        items = client.get_shared_album_images(
+            'u!abc', recursive=True, first_page=[image('a.jpg')], next_link='https://next'
+        )
+
+        assert sorted(item.filename for item in items) == ['a.jpg', 'b.jpg', 'f1/c.jpg']
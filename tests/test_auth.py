@@ -2,14 +2,16 @@
 """Test authentication setup."""
 
 import sys
-import json
 from pathlib import Path
 from msal import PublicClientApplication
 
-# Load config from parent directory
-config_path = Path(__file__).parent.parent / 'config.json'
-with open(config_path) as f:
-    config = json.load(f)
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests._config import get_config
+from tests._output import pp
+
+config = get_config()
 
 print(f"Client ID: {config['client_id']}")
 print(f"Authority: {config['authority']}")
@@ -40,7 +42,7 @@ try:
         print("="*60)
     else:
         print("\nERROR: No user_code in flow response")
-        print(f"Response: {json.dumps(flow, indent=2)}")
+        print(f"Response: {pp(flow)}")
 
 except Exception as e:
     print(f"\nEXCEPTION: {e}")
@@ -0,0 +1,65 @@
+"""Unit tests for onedrive_downloader.auth module."""
+
+import json
+import pytest
+from onedrive_downloader import auth
+from onedrive_downloader.auth import OneDriveAuthenticator
+
+
+class FakeApplication:
+    """Stand-in for msal.PublicClientApplication (which fetches metadata on creation)."""
+
+    created = 0
+
+    def __init__(self, client_id, authority, token_cache):
+        FakeApplication.created += 1
+        self.token_cache = token_cache
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(auth, 'PublicClientApplication', FakeApplication)
+    monkeypatch.setattr(auth, '_msal_apps', {})
+    monkeypatch.setattr(auth, '_cache_mtimes_ns', {})
+    FakeApplication.created = 0
+
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({
+        'client_id': 'client',
+        'authority': 'https://login.microsoftonline.com/common',
+    }))
+    return path
+
+
+class TestMsalApplicationReuse:
+    """Tests for process-wide MSAL application reuse."""
+
+    def test_authenticators_share_one_application(self, config_path):
+        first = OneDriveAuthenticator(config_path)
+        second = OneDriveAuthenticator(config_path)
+
+        assert FakeApplication.created == 1
+        assert second.app is first.app
+        assert second.cache is first.cache
+
+    def test_unchanged_cache_file_is_not_reloaded(self, config_path, monkeypatch):
+        (config_path.parent / auth.TOKEN_CACHE_FILE).write_text('{}')
+        loads = []
+
+        first = OneDriveAuthenticator(config_path)
+        monkeypatch.setattr(first.cache, 'deserialize', loads.append)
+        OneDriveAuthenticator(config_path)
+
+        assert loads == []
+
+    def test_clear_cache_drops_the_shared_application(self, config_path):
+        (config_path.parent / auth.TOKEN_CACHE_FILE).write_text('{}')
+        first = OneDriveAuthenticator(config_path)
+
+        first.clear_cache()
+        second = OneDriveAuthenticator(config_path)
+
+        assert FakeApplication.created == 2
+        assert second.cache is not first.cache
+        assert not (config_path.parent / auth.TOKEN_CACHE_FILE).exists()
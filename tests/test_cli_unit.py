@@ -0,0 +1,143 @@
+"""Unit tests for onedrive_downloader.cli module."""
+
+import json
+import shutil
+import pytest
+from click.testing import CliRunner
+from onedrive_downloader import api, auth
+from onedrive_downloader.cli import main, _delta_key
+from onedrive_downloader.config import DELTA_CACHE_FILE
+from onedrive_downloader.downloader import ImageDownloader, DownloadResult
+from onedrive_downloader.models import ImageItem
+
+ALBUM_URL = "https://1drv.ms/a/c/test"
+DELTA_LINK = "https://graph.microsoft.com/v1.0/drives/d/items/root/delta?token=2"
+
+
+class FakeAuthenticator:
+    def __init__(self, config_path):
+        pass
+
+    def get_access_token(self):
+        return "token"
+
+
+class FakeClient:
+    """Album 'Album' whose delta returns one image on a full listing and nothing after."""
+
+    delta_tokens = []
+
+    def __init__(self, access_token, cache_file=None):
+        self.skipped_items = []
+
+    def get_album_info(self, encoded_sharing_url):
+        return {'name': 'Album', 'drive_id': 'd', 'item_id': 'root'}
+
+    def get_delta_image_items(self, drive_id, item_id, token=None, recursive=True, folder_paths=None):
+        FakeClient.delta_tokens.append(token)
+        if token is not None:
+            return [], DELTA_LINK
+        folder_paths['f1'] = 'Trip/'
+        return [ImageItem('Trip/a.jpg', 'https://cdn.example.com/a', 1, 'image/jpeg')], DELTA_LINK
+
+
+async def fake_download(self, session, url, safe_filename, output_path, progress_callback=None):
+    output_path.write_bytes(b'x')
+    result = DownloadResult(safe_filename, success=True, size=1)
+    if progress_callback:
+        progress_callback(result)
+    return result
+
+
+async def failing_download(self, session, url, safe_filename, output_path, progress_callback=None):
+    result = DownloadResult(safe_filename, success=False, error="HTTP 500")
+    if progress_callback:
+        progress_callback(result)
+    return result
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(api, 'prewarm_dns', lambda: None)
+    monkeypatch.setattr(api, 'OneDriveAPIClient', FakeClient)
+    monkeypatch.setattr(auth, 'OneDriveAuthenticator', FakeAuthenticator)
+    monkeypatch.setattr(ImageDownloader, '_download', fake_download)
+    FakeClient.delta_tokens = []
+
+    def run(*args):
+        return CliRunner().invoke(main, [ALBUM_URL, '--incremental', *args])
+
+    return run
+
+
+def saved_delta_cache():
+    with open(DELTA_CACHE_FILE) as f:
+        return json.load(f)
+
+
+class TestIncrementalDelta:
+    """Tests for saving and reusing delta links across --incremental runs."""
+
+    def test_saved_link_is_reused_for_the_same_output(self, run, tmp_path):
+        assert run('-o', 'out').exit_code == 0
+        assert (tmp_path / 'out' / 'Album' / 'Trip' / 'a.jpg').exists()
+
+        key = _delta_key('d', 'root', tmp_path / 'out' / 'Album', True)
+        assert saved_delta_cache() == {key: {'delta_link': DELTA_LINK, 'folder_paths': {'f1': 'Trip/'}}}
+
+        result = run('-o', 'out')
+
+        assert result.exit_code == 0
+        assert "No new or changed images" in result.output
+        assert FakeClient.delta_tokens == [None, DELTA_LINK]
+
+    def test_other_output_or_recursion_starts_a_full_listing(self, run):
+        run('-o', 'out')
+        run('-o', 'elsewhere')
+        run('-o', 'out', '--no-recursive')
+
+        assert FakeClient.delta_tokens == [None, None, None]
+
+    def test_missing_output_directory_starts_a_full_listing(self, run, tmp_path):
+        run('-o', 'out')
+        shutil.rmtree(tmp_path / 'out' / 'Album')
+
+        result = run('-o', 'out')
+
+        assert FakeClient.delta_tokens == [None, None]
+        assert result.exit_code == 0
+        assert (tmp_path / 'out' / 'Album' / 'Trip' / 'a.jpg').exists()
+
+    def test_legacy_link_without_folder_paths_starts_a_full_listing(self, run, tmp_path):
+        key = _delta_key('d', 'root', tmp_path / 'out' / 'Album', True)
+        (tmp_path / 'out' / 'Album').mkdir(parents=True)
+        (tmp_path / 'out' / 'Album' / 'old.jpg').write_bytes(b'x')
+        with open(DELTA_CACHE_FILE, 'w') as f:
+            json.dump({key: DELTA_LINK}, f)
+
+        run('-o', 'out')
+
+        assert FakeClient.delta_tokens == [None]
+
+    def test_link_is_not_saved_when_a_download_fails(self, run, monkeypatch, tmp_path):
+        monkeypatch.setattr(ImageDownloader, '_download', failing_download)
+
+        result = run('-o', 'out')
+
+        assert result.exit_code == 1
+        assert not (tmp_path / DELTA_CACHE_FILE).exists()
+
+    def test_link_is_not_saved_when_images_were_skipped(self, run, monkeypatch, tmp_path):
+        class SkippingClient(FakeClient):
+            def get_delta_image_items(self, *args, **kwargs):
+                self.skipped_items.append('b.jpg')
+                return super().get_delta_image_items(*args, **kwargs)
+
+        monkeypatch.setattr(api, 'OneDriveAPIClient', SkippingClient)
+
+        result = run('-o', 'out')
+
+        assert result.exit_code == 0
+        assert "1 image(s) skipped" in result.output
+        assert not (tmp_path / DELTA_CACHE_FILE).exists()
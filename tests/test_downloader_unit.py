@@ -0,0 +1,392 @@
+"""Unit tests for onedrive_downloader.downloader module."""
+
+import asyncio
+import aiohttp
+import pytest
+from types import SimpleNamespace
+from onedrive_downloader import downloader as downloader_module
+from onedrive_downloader.config import DOWNLOAD_RETRY_BASE_DELAY
+from onedrive_downloader.downloader import ImageDownloader, DownloadResult
+from onedrive_downloader.models import ImageItem
+
+
+def make_item(name, size=10):
+    return ImageItem(
+        filename=name,
+        download_url=f"https://cdn.example.com/{name}",
+        size=size,
+        mime_type="image/jpeg"
+    )
+
+
+class FakeContent:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+
+
+class FakeDownloadResponse:
+    def __init__(self, chunks, status=200):
+        self.content = FakeContent(chunks)
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(SimpleNamespace(real_url='u'), (), status=self.status)
+
+
+class FakeDownloadSession:
+    """Serves each URL from a list of responses, one per request."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        self.requests.append(url)
+        response = self.responses[url].pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+async def run_stream(downloader, *args, **kwargs):
+    async with downloader:
+        return await downloader.download_stream(*args, **kwargs)
+
+
+async def produce(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+class TestDownloadStream:
+    """Tests for the enumeration/download pipeline."""
+
+    def test_downloads_every_produced_item(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, concurrent=3)
+        downloaded = []
+
+        async def fake_download(session, url, filename, *args):
+            downloaded.append(filename)
+            return DownloadResult(filename=filename, success=True, size=10)
+
+        downloader._download = fake_download
+        items = [make_item(f"{i}.jpg") for i in range(10)]
+        found = []
+
+        results = asyncio.run(run_stream(downloader, produce(items), found_callback=found.append))
+
+        assert sorted(downloaded) == sorted(item.filename for item in items)
+        assert len(results) == 10
+        assert found == items
+
+    def test_enumeration_error_propagates(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, concurrent=2)
+
+        async def fake_download(session, url, filename, *args):
+            return DownloadResult(filename=filename, success=True)
+
+        async def failing_producer():
+            yield make_item("a.jpg")
+            raise RuntimeError("listing failed")
+
+        downloader._download = fake_download
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            asyncio.run(run_stream(downloader, failing_producer()))
+
+    def test_worker_error_propagates_instead_of_hanging(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, concurrent=2)
+
+        async def fake_download(session, url, filename, *args):
+            if int(filename.split('.')[0]) >= 3:
+                raise ValueError("bad item")
+            return DownloadResult(filename=filename, success=True)
+
+        downloader._download = fake_download
+        items = [make_item(f"{i}.jpg") for i in range(50)]
+
+        async def run():
+            return await asyncio.wait_for(run_stream(downloader, produce(items)), timeout=5)
+
+        with pytest.raises(ValueError, match="bad item"):
+            asyncio.run(run())
+
+    def test_download_all_keeps_input_order_with_bounded_concurrency(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, concurrent=2)
+        in_flight = 0
+        peak = 0
+
+        async def fake_download(session, url, filename, *args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (int(filename.split('.')[0]) % 3))
+            in_flight -= 1
+            return DownloadResult(filename=filename, success=True)
+
+        downloader._download = fake_download
+        items = [make_item(f"{i}.jpg") for i in range(8)]
+
+        async def run():
+            async with downloader:
+                return await downloader.download_all(items)
+
+        results = asyncio.run(run())
+
+        assert [r.filename for r in results] == [item.filename for item in items]
+        assert peak == 2
+
+    def test_complete_files_are_skipped_without_a_worker(self, tmp_path):
+        (tmp_path / 'a.jpg').write_bytes(b'0123456789')
+        downloader = ImageDownloader(tmp_path, concurrent=1)
+        downloaded = []
+
+        async def fake_download(session, url, filename, *args):
+            downloaded.append(filename)
+            return DownloadResult(filename=filename, success=True, size=10)
+
+        downloader._download = fake_download
+        items = [make_item('a.jpg'), make_item('b:c.jpg')]
+
+        results = asyncio.run(run_stream(downloader, produce(items)))
+
+        assert [r.skipped for r in results] == [True, False]
+        assert downloaded == ['b_c.jpg']
+
+
+class TestSubfolderLayout:
+    """Tests for images enumerated from album subfolders."""
+
+    def test_same_names_in_different_folders_are_both_kept(self, tmp_path):
+        items = [make_item('IMG_0001.jpg', size=1), make_item('Trip/IMG_0001.jpg', size=2)]
+        session = FakeDownloadSession({
+            items[0].download_url: [FakeDownloadResponse([b'a'])],
+            items[1].download_url: [FakeDownloadResponse([b'bb'])],
+        })
+        downloader = ImageDownloader(tmp_path)
+        downloader._get_session = lambda: session
+
+        results = asyncio.run(downloader.download_stream(produce(items)))
+
+        assert all(r.success and not r.skipped for r in results)
+        assert (tmp_path / 'IMG_0001.jpg').read_bytes() == b'a'
+        assert (tmp_path / 'Trip' / 'IMG_0001.jpg').read_bytes() == b'bb'
+
+        # A second run finds both complete files in the snapshot
+        results = asyncio.run(run_stream(ImageDownloader(tmp_path), produce(items)))
+        assert all(r.skipped for r in results)
+
+    def test_directories_are_created_before_queueing_only(self, tmp_path):
+        items = [make_item('Trip/a.jpg'), make_item('Trip/b.jpg'), make_item('Other/c.jpg')]
+        session = FakeDownloadSession({item.download_url: [FakeDownloadResponse([b'x'])] for item in items})
+        downloader = ImageDownloader(tmp_path, concurrent=2)
+        downloader._get_session = lambda: session
+        ensured = []
+        ensure_parent = downloader._ensure_parent
+
+        def recording_ensure_parent(output_path):
+            ensured.append(output_path)
+            ensure_parent(output_path)
+
+        downloader._ensure_parent = recording_ensure_parent
+
+        results = asyncio.run(downloader.download_stream(produce(items)))
+
+        # Once per queued item from the producer; workers never create directories
+        assert ensured == [tmp_path / item.filename for item in items]
+        assert all(r.success for r in results)
+        assert (tmp_path / 'Other' / 'c.jpg').read_bytes() == b'x'
+
+
+class TestSessionReuse:
+    """Tests for the downloader's shared keep-alive session."""
+
+    def test_reuses_one_session_until_closed(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, concurrent=4)
+        sessions = []
+
+        async def fake_download(session, url, filename, *args):
+            sessions.append(session)
+            return DownloadResult(filename=filename, success=True)
+
+        downloader._download = fake_download
+
+        async def run():
+            async with downloader:
+                await downloader.download_all([make_item("a.jpg")])
+                await downloader.download_stream(produce([make_item("b.jpg")]))
+                connector = downloader._session.connector
+            return connector
+
+        connector = asyncio.run(run())
+
+        assert sessions[0] is sessions[1]
+        assert connector.limit_per_host == 4
+        assert downloader._session is None
+
+    def test_download_all_without_async_with_closes_its_session(self, tmp_path):
+        downloader = ImageDownloader(tmp_path)
+        sessions = []
+
+        async def fake_download(session, url, filename, *args):
+            sessions.append(session)
+            return DownloadResult(filename=filename, success=True)
+
+        downloader._download = fake_download
+
+        # Each asyncio.run has its own event loop; the second call must not
+        # pick up a session bound to the first (now closed) loop
+        asyncio.run(downloader.download_all([make_item("a.jpg")]))
+        asyncio.run(downloader.download_all([make_item("b.jpg")]))
+
+        assert len(sessions) == 2
+        assert all(session.closed for session in sessions)
+        assert downloader._session is None
+
+
+class TestDownloadImage:
+    """Tests for ImageDownloader.download_image."""
+
+    def test_streams_chunks_to_file(self, tmp_path):
+        downloader = ImageDownloader(tmp_path)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'abc', b'def'])]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg'))
+
+        assert result.success and result.size == 6
+        assert (tmp_path / 'a.jpg').read_bytes() == b'abcdef'
+        assert not (tmp_path / 'a.jpg.partial').exists()
+
+    def test_retries_server_errors_with_jittered_backoff(self, tmp_path, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(downloader_module.asyncio, 'sleep', fake_sleep)
+        downloader = ImageDownloader(tmp_path, max_retries=3)
+        session = FakeDownloadSession({'u': [
+            FakeDownloadResponse([], status=503),
+            FakeDownloadResponse([], status=429),
+            FakeDownloadResponse([b'ok']),
+        ]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg'))
+
+        assert result.success
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= DOWNLOAD_RETRY_BASE_DELAY
+        assert 0 <= delays[1] <= DOWNLOAD_RETRY_BASE_DELAY * 2
+
+    def test_does_not_retry_permanent_client_errors(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, max_retries=3)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([], status=404)]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg'))
+
+        assert not result.success
+        assert session.requests == ['u']
+        assert not (tmp_path / 'a.jpg').exists()
+
+    def test_timeout_mid_stream_removes_partial_file(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, max_retries=1)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'abc', asyncio.TimeoutError()])]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg'))
+
+        assert not result.success
+        assert result.error.startswith("Timeout")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unexpected_error_fails_the_file_without_retrying(self, tmp_path):
+        downloader = ImageDownloader(tmp_path, max_retries=3)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'abc', ValueError("bad chunk")])]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg'))
+
+        assert not result.success
+        assert result.error == "ValueError: bad chunk"
+        assert session.requests == ['u']
+        assert list(tmp_path.iterdir()) == []
+
+    def test_skips_existing_file_with_matching_size(self, tmp_path):
+        (tmp_path / 'a.jpg').write_bytes(b'abc')
+        downloader = ImageDownloader(tmp_path)
+        session = FakeDownloadSession({'u': []})
+
+        result = asyncio.run(downloader.download_image(
+            session, 'u', 'a.jpg', None, 3, downloader._existing_sizes()
+        ))
+
+        assert result.skipped
+        assert session.requests == []
+
+    def test_redownloads_existing_file_with_wrong_size(self, tmp_path):
+        (tmp_path / 'a.jpg').write_bytes(b'ab')
+        downloader = ImageDownloader(tmp_path)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'abc'])]})
+
+        result = asyncio.run(downloader.download_image(
+            session, 'u', 'a.jpg', None, 3, downloader._existing_sizes()
+        ))
+
+        assert result.success and not result.skipped
+        assert (tmp_path / 'a.jpg').read_bytes() == b'abc'
+
+    def test_nested_names_keep_their_folders(self, tmp_path):
+        downloader = ImageDownloader(tmp_path)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'abc'])]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'sub/dir?/a.jpg'))
+
+        assert result.filename == 'sub/dir_/a.jpg'
+        assert (tmp_path / 'sub' / 'dir_' / 'a.jpg').read_bytes() == b'abc'
+        assert [p.name for p in tmp_path.iterdir()] == ['sub']
+
+    def test_failed_redownload_keeps_previous_file(self, tmp_path):
+        (tmp_path / 'a.jpg').write_bytes(b'ab')
+        downloader = ImageDownloader(tmp_path, max_retries=1)
+        session = FakeDownloadSession({'u': [FakeDownloadResponse([b'a', asyncio.TimeoutError()])]})
+
+        result = asyncio.run(downloader.download_image(session, 'u', 'a.jpg', None, 3))
+
+        assert not result.success
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['a.jpg']
+        assert (tmp_path / 'a.jpg').read_bytes() == b'ab'
+
+
+class TestGetStats:
+    """Tests for ImageDownloader.get_stats."""
+
+    def test_counts_results_in_one_pass(self, tmp_path):
+        results = [
+            DownloadResult("a.jpg", success=True, size=100),
+            DownloadResult("b.jpg", success=True, size=50, skipped=True),
+            DownloadResult("c.jpg", success=False, error="boom"),
+        ]
+
+        stats = ImageDownloader(tmp_path).get_stats(iter(results))
+
+        assert stats == {
+            'total': 3,
+            'successful': 2,
+            'downloaded': 1,
+            'skipped': 1,
+            'failed': 1,
+            'total_size': 150,
+            'total_size_formatted': "150 B",
+        }
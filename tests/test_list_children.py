@@ -7,9 +7,9 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import json
 import requests
 from onedrive_downloader.auth import get_authenticated_token
+from tests._output import dump_error
 
 try:
     from test_config import TEST_DRIVE_ID, TEST_ITEM_ID
@@ -29,24 +29,35 @@ item_id = TEST_ITEM_ID
 print(f"Drive ID: {drive_id}")
 print(f"Item ID: {item_id}\n")
 
-# Try API call
-api_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{item_id}/children"
+# Try API call; only request the fields printed below
+api_url = (
+    f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{item_id}/children"
+    f"?$select=id,name,size,image,file&$top=200"
+)
 print(f"API URL: {api_url}\n")
 
-headers = {
+# One session for every request so the Graph connection is reused
+SESSION = requests.Session()
+SESSION.headers.update({
     'Authorization': f'Bearer {token}',
-    'Content-Type': 'application/json'
-}
+    'Accept': 'application/json',
+    'Prefer': 'odata.maxpagesize=200'
+})
 
 print("Making API request...")
-response = requests.get(api_url, headers=headers)
+items = []
+while api_url:
+    response = SESSION.get(api_url)
+    if response.status_code != 200:
+        break
+    data = response.json()
+    items.extend(data.get('value', []))
+    api_url = data.get('@odata.nextLink')
 
 print(f"Status Code: {response.status_code}\n")
 
 if response.status_code == 200:
     print("✓ SUCCESS!")
-    data = response.json()
-    items = data.get('value', [])
     print(f"Found {len(items)} items\n")
 
     # Show first few items
@@ -56,9 +67,4 @@ if response.status_code == 200:
             print(f"   Image: {item['image']}")
 else:
     print("✗ ERROR!")
-    print(f"Response Text: {response.text}")
-    try:
-        error_data = response.json()
-        print(f"\nError JSON: {json.dumps(error_data, indent=2)}")
-    except:
-        pass
+    dump_error(response)
@@ -55,3 +55,8 @@ class TestImageItem:
 
     def test_fields(self):
         assert ImageItem._fields == ('filename', 'download_url', 'size', 'mime_type')
+
+    def test_has_no_instance_dict(self):
+        item = ImageItem("a.jpg", "https://example.com/a.jpg", 1, "image/jpeg")
+        # Per-item memory stays at tuple size for large albums
+        assert not hasattr(item, '__dict__')
@@ -56,3 +56,12 @@ class TestParseAndEncodeUrl:
         assert result.startswith("u!")
         # Same input should give same output
         assert result == parse_and_encode_url(url)
+
+    def test_repeat_calls_are_cached(self):
+        url = "https://1drv.ms/a/c/cached123"
+        parse_and_encode_url(url)
+        hits = parse_and_encode_url.cache_info().hits
+
+        parse_and_encode_url(url)
+
+        assert parse_and_encode_url.cache_info().hits == hits + 1
@@ -7,10 +7,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import json
 import requests
 from onedrive_downloader.auth import get_authenticated_token
 from onedrive_downloader.parser import parse_and_encode_url
+from tests._output import dump_error, pp
 
 try:
     from test_config import TEST_ALBUM_URL
@@ -35,13 +35,15 @@ print(f"Encoded URL: {encoded_url}\n")
 api_url = f"https://graph.microsoft.com/v1.0/shares/{encoded_url}/driveItem"
 print(f"API URL: {api_url}\n")
 
-headers = {
+# One session for every request so the Graph connection is reused
+SESSION = requests.Session()
+SESSION.headers.update({
     'Authorization': f'Bearer {token}',
-    'Content-Type': 'application/json'
-}
+    'Accept': 'application/json'
+})
 
 print("Making API request...")
-response = requests.get(api_url, headers=headers)
+response = SESSION.get(api_url)
 
 print(f"Status Code: {response.status_code}\n")
 
@@ -57,12 +59,7 @@ if response.status_code == 200:
         print(f"Child Count: {child_count}")
 
     print(f"\nFull response:")
-    print(json.dumps(data, indent=2))
+    print(pp(data))
 else:
     print("✗ ERROR!")
-    print(f"Response Text: {response.text}")
-    try:
-        error_data = response.json()
-        print(f"\nError JSON: {json.dumps(error_data, indent=2)}")
-    except:
-        pass
+    dump_error(response)
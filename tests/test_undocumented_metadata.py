@@ -7,10 +7,27 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import io
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from onedrive_downloader.auth import get_authenticated_token
 from onedrive_downloader.parser import parse_and_encode_url
+from tests._output import dump_error, pp
+
+try:
+    # Optional: run the probes as multiplexed HTTP/2 streams on one connection
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+try:
+    # Optional: print large responses incrementally instead of buffering them
+    import ijson
+except ImportError:
+    ijson = None
 
 try:
     from test_config import TEST_ALBUM_URL
@@ -19,6 +36,18 @@ except ImportError:
     print("Copy test_config.py.example to test_config.py and configure your test URL.")
     sys.exit(1)
 
+# Every probe goes to graph.microsoft.com: share one pooled keep-alive session
+# (one HTTP/2 connection with httpx). The Authorization header is added once
+# the token is known.
+if httpx is not None:
+    SESSION = httpx.Client(http2=True, timeout=30.0)
+else:
+    SESSION = requests.Session()
+    SESSION.mount('https://graph.microsoft.com', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+SESSION.headers['Accept'] = 'application/json'
+# Already the client default; pin it so the expanded probes stay compressed
+SESSION.headers['Accept-Encoding'] = 'gzip, deflate'
+
 
 def print_section(title):
     """Print a section header."""
@@ -27,38 +56,114 @@ def print_section(title):
     print("="*70 + "\n")
 
 
-def make_request(url, token, description):
-    """Make API request and print results."""
+def fetch(url):
+    """
+    GET a URL on the shared session; returns the response, or the exception raised.
+
+    With requests the body is left unread (stream=True) so report() can print
+    it incrementally; httpx reads it here, keeping the HTTP/2 streams concurrent.
+    """
+    try:
+        if httpx is not None:
+            return SESSION.get(url)
+        return SESSION.get(url, stream=True)
+    except Exception as e:
+        return e
+
+
+def stream_json(raw, indent=2):
+    """Pretty-print a JSON document from ijson events, without holding it in memory."""
+    write = sys.stdout.write
+    depth = 0
+    need_comma = False
+    after_key = False
+
+    for _, event, value in ijson.parse(raw, use_float=True):
+        if event in ('end_map', 'end_array'):
+            depth -= 1
+            if need_comma:
+                # Non-empty container: closing bracket goes on its own line
+                write('\n' + ' ' * (indent * depth))
+            write('}' if event == 'end_map' else ']')
+            need_comma = True
+            continue
+
+        # A value directly follows its key; anything else starts a new element
+        if not after_key:
+            if need_comma:
+                write(',')
+            if depth:
+                write('\n' + ' ' * (indent * depth))
+        after_key = event == 'map_key'
+
+        if event == 'map_key':
+            write(json.dumps(value) + ': ')
+        elif event in ('start_map', 'start_array'):
+            write('{' if event == 'start_map' else '[')
+            depth += 1
+            need_comma = False
+        else:
+            write(json.dumps(value))
+            need_comma = True
+
+    write('\n')
+
+
+def report(url, description, outcome, keep=False):
+    """
+    Print the result of a fetched probe.
+
+    Returns the parsed data on success when keep is True (later probes need it);
+    other successful bodies are streamed to stdout when ijson is installed.
+    """
     print(f"Testing: {description}")
     print(f"URL: {url}\n")
 
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json'
-    }
+    if isinstance(outcome, Exception):
+        print(f"\n✗ Exception: {outcome}")
+        return None
 
-    try:
-        response = requests.get(url, headers=headers)
-        print(f"Status: {response.status_code}")
+    response = outcome
+    print(f"Status: {response.status_code}")
+    print(f"Content-Encoding: {response.headers.get('Content-Encoding', 'none')}")
 
+    try:
         if response.status_code == 200:
-            data = response.json()
             print("\n✓ SUCCESS! Response data:")
-            print(json.dumps(data, indent=2))
+            if ijson is not None and not keep:
+                raw = getattr(response, 'raw', None)
+                if raw is None:
+                    # httpx response: the body has already been read
+                    raw = io.BytesIO(response.content)
+                else:
+                    # Let urllib3 undo gzip/deflate while ijson reads the raw stream
+                    raw.decode_content = True
+                stream_json(raw)
+                return None
+
+            data = response.json()
+            print(pp(data))
             return data
         else:
             print(f"\n✗ Failed: {response.status_code}")
-            try:
-                error = response.json()
-                print(json.dumps(error, indent=2))
-            except:
-                print(response.text)
+            dump_error(response)
             return None
 
     except Exception as e:
         print(f"\n✗ Exception: {e}")
         return None
 
+    finally:
+        response.close()
+
+
+def first_child_ids(children_data):
+    """Return (drive_id, item_id) of the first child in a listing, or (None, None)."""
+    if children_data and children_data.get('value'):
+        first_child = children_data['value'][0]
+        return first_child.get('parentReference', {}).get('driveId'), first_child.get('id')
+    return None, None
+
 
 def main():
     print_section("DISCOVERING UNDOCUMENTED ONEDRIVE METADATA")
@@ -66,6 +171,7 @@ def main():
     # Get authentication token
     print("Getting access token...")
     token = get_authenticated_token()
+    SESSION.headers['Authorization'] = f'Bearer {token}'
     print("✓ Authenticated\n")
 
     # Parse and encode the album URL
@@ -74,18 +180,6 @@ def main():
     encoded_url = parse_and_encode_url(album_url)
     print(f"Encoded: {encoded_url}\n")
 
-    # Test 1: Beta API with all fields
-    print_section("TEST 1: Beta API with $select=*")
-    beta_url = f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$select=*"
-    beta_data = make_request(beta_url, token, "Beta endpoint with all fields")
-
-    # Test 2: Beta API with expand
-    print_section("TEST 2: Beta API with $expand")
-    expand_url = f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$expand=children,thumbnails"
-    make_request(expand_url, token, "Beta endpoint with expand")
-
-    # Test 3: Request specific vision-related fields
-    print_section("TEST 3: Request Vision/AI Fields")
     vision_fields = [
         "image",
         "photo",
@@ -105,53 +199,74 @@ def main():
         "searchableText"
     ]
     select_fields = ",".join(vision_fields)
-    vision_url = f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$select={select_fields}"
-    make_request(vision_url, token, "Specific vision/AI fields")
 
-    # Test 4: Get children with all metadata
-    print_section("TEST 4: Children with All Metadata")
-    children_url = f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem/children?$select=*&$top=1"
-    children_data = make_request(children_url, token, "First child item with all fields")
-
-    # Test 5: Thumbnails endpoint (might contain analysis data)
-    print_section("TEST 5: Thumbnails Endpoint")
-    if children_data and 'value' in children_data and len(children_data['value']) > 0:
-        first_child = children_data['value'][0]
-        child_id = first_child.get('id')
+    # Independent probes, keyed by test number: (section title, URL, description)
+    probes = {
+        1: ("TEST 1: Beta API with $select=*",
+            f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$select=*",
+            "Beta endpoint with all fields"),
+        2: ("TEST 2: Beta API with $expand",
+            f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$expand=children,thumbnails",
+            "Beta endpoint with expand"),
+        3: ("TEST 3: Request Vision/AI Fields",
+            f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$select={select_fields}",
+            "Specific vision/AI fields"),
+        4: ("TEST 4: Children with All Metadata",
+            f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem/children?$select=*&$top=1",
+            "First child item with all fields"),
+        8: ("TEST 8: Everything Expanded",
+            f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$expand=children($select=*;$expand=thumbnails),thumbnails,permissions,analytics",
+            "All expansions at once"),
+    }
 
-        # Get parent drive ID from the child's parentReference
-        parent_ref = first_child.get('parentReference', {})
-        drive_id = parent_ref.get('driveId')
+    # Requests run concurrently; results are printed in test order from this
+    # thread, so output never interleaves
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        # Phase A: everything that does not depend on another probe
+        pending = {number: executor.submit(fetch, url) for number, (_, url, _) in probes.items()}
 
-        if drive_id and child_id:
-            thumb_url = f"https://graph.microsoft.com/beta/drives/{drive_id}/items/{child_id}/thumbnails"
-            make_request(thumb_url, token, "Thumbnails for first image")
+        data = {}
+        for number in (1, 2, 3, 4):
+            title, url, description = probes[number]
+            print_section(title)
+            # Tests 1 and 4 feed phase B, so their bodies are parsed rather than streamed
+            data[number] = report(url, description, pending[number].result(), keep=number in (1, 4))
 
-    # Test 6: Analytics endpoint
-    print_section("TEST 6: Analytics Endpoint")
-    if children_data and 'value' in children_data and len(children_data['value']) > 0:
-        first_child = children_data['value'][0]
-        child_id = first_child.get('id')
-        parent_ref = first_child.get('parentReference', {})
-        drive_id = parent_ref.get('driveId')
+        # Phase B: probes that need the first child or the beta item's drive.
+        # A probe whose input is missing only gets its section header.
+        titles = {
+            5: "TEST 5: Thumbnails Endpoint",
+            6: "TEST 6: Analytics Endpoint",
+            7: "TEST 7: Search API",
+        }
 
+        drive_id, child_id = first_child_ids(data[4])
         if drive_id and child_id:
-            analytics_url = f"https://graph.microsoft.com/beta/drives/{drive_id}/items/{child_id}/analytics"
-            make_request(analytics_url, token, "Analytics for first image")
-
-    # Test 7: Search API (might expose AI tags)
-    print_section("TEST 7: Search API")
-    if beta_data:
-        drive_id = beta_data.get('parentReference', {}).get('driveId')
-        if drive_id:
+            probes[5] = (titles[5],
+                         f"https://graph.microsoft.com/beta/drives/{drive_id}/items/{child_id}/thumbnails",
+                         "Thumbnails for first image")
+            probes[6] = (titles[6],
+                         f"https://graph.microsoft.com/beta/drives/{drive_id}/items/{child_id}/analytics",
+                         "Analytics for first image")
+
+        search_drive_id = (data[1] or {}).get('parentReference', {}).get('driveId')
+        if search_drive_id:
             # Search for all images in this drive
-            search_url = f"https://graph.microsoft.com/beta/drives/{drive_id}/root/search(q='.jpg')?$top=1"
-            search_data = make_request(search_url, token, "Search API results")
+            probes[7] = (titles[7],
+                         f"https://graph.microsoft.com/beta/drives/{search_drive_id}/root/search(q='.jpg')?$top=1",
+                         "Search API results")
+
+        for number in (5, 6, 7):
+            if number in probes:
+                pending[number] = executor.submit(fetch, probes[number][1])
 
-    # Test 8: Get item with all possible expansions
-    print_section("TEST 8: Everything Expanded")
-    everything_url = f"https://graph.microsoft.com/beta/shares/{encoded_url}/driveItem?$expand=children($select=*;$expand=thumbnails),thumbnails,permissions,analytics"
-    make_request(everything_url, token, "All expansions at once")
+        for number in (5, 6, 7, 8):
+            if number not in probes:
+                print_section(titles[number])
+                continue
+            title, url, description = probes[number]
+            print_section(title)
+            report(url, description, pending[number].result())
 
     print_section("DISCOVERY COMPLETE")
     print("Review the output above to see what fields are available.")
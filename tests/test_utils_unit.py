@@ -3,6 +3,7 @@
 import pytest
 from onedrive_downloader.utils import (
     sanitize_filename,
+    sanitize_relative_path,
     encode_sharing_url,
     parse_album_id,
     get_image_extension,
@@ -14,18 +15,17 @@ from onedrive_downloader.utils import (
 class TestSanitizeFilename:
     """Tests for sanitize_filename function."""
 
-    def test_basic_filename(self):
-        assert sanitize_filename("photo.jpg") == "photo.jpg"
-
-    def test_removes_invalid_chars(self):
-        assert sanitize_filename('file<>:"/\\|?*.jpg') == "file_________.jpg"
-
-    def test_strips_leading_trailing_dots_spaces(self):
-        assert sanitize_filename("  ..photo.jpg.. ") == "photo.jpg"
-
-    def test_empty_becomes_unnamed(self):
-        assert sanitize_filename("") == "unnamed"
-        assert sanitize_filename("...") == "unnamed"
+    @pytest.mark.parametrize("filename,expected", [
+        ("photo.jpg", "photo.jpg"),
+        ('file<>:"/\\|?*.jpg', "file_________.jpg"),
+        ("a\x00b\tc\x1f.jpg", "a_b_c_.jpg"),
+        ("  ..photo.jpg.. ", "photo.jpg"),
+        ("", "unnamed"),
+        ("...", "unnamed"),
+        ("фото_日本語.jpg", "фото_日本語.jpg"),
+    ])
+    def test_sanitize_filename(self, filename, expected):
+        assert sanitize_filename(filename) == expected
 
     def test_truncates_long_filenames(self):
         long_name = "a" * 300 + ".jpg"
@@ -33,8 +33,18 @@ class TestSanitizeFilename:
         assert len(result) <= 255
         assert result.endswith(".jpg")
 
-    def test_preserves_unicode(self):
-        assert sanitize_filename("фото_日本語.jpg") == "фото_日本語.jpg"
+
+class TestSanitizeRelativePath:
+    """Tests for sanitize_relative_path function."""
+
+    @pytest.mark.parametrize("path,expected", [
+        ("photo.jpg", "photo.jpg"),
+        ("Trip/Day 1/photo?.jpg", "Trip/Day 1/photo_.jpg"),
+        ("../photo.jpg", "unnamed/photo.jpg"),
+        ("a//b.jpg", "a/unnamed/b.jpg"),
+    ])
+    def test_sanitize_relative_path(self, path, expected):
+        assert sanitize_relative_path(path) == expected
 
 
 class TestEncodeSharingUrl:
@@ -86,45 +96,43 @@ class TestParseAlbumId:
 class TestGetImageExtension:
     """Tests for get_image_extension function."""
 
-    def test_extracts_from_filename(self):
-        assert get_image_extension("photo.jpg") == ".jpg"
-        assert get_image_extension("image.PNG") == ".png"
-
-    def test_uses_mime_type_fallback(self):
-        assert get_image_extension("", "image/jpeg") == ".jpg"
-        assert get_image_extension("", "image/png") == ".png"
-        assert get_image_extension("", "image/gif") == ".gif"
-
-    def test_defaults_to_jpg(self):
-        assert get_image_extension("") == ".jpg"
-        assert get_image_extension("", "unknown/type") == ".jpg"
-
-    def test_filename_takes_priority(self):
-        assert get_image_extension("photo.png", "image/jpeg") == ".png"
+    @pytest.mark.parametrize("filename,mime_type,expected", [
+        # Extension from the filename, lowercased
+        ("photo.jpg", None, ".jpg"),
+        ("image.PNG", None, ".png"),
+        ("photo.", "image/png", ".png"),
+        # MIME type fallback
+        ("", "image/jpeg", ".jpg"),
+        ("", "image/png", ".png"),
+        ("", "image/gif", ".gif"),
+        # Defaults to .jpg
+        ("", None, ".jpg"),
+        ("", "unknown/type", ".jpg"),
+        # Filename takes priority over the MIME type
+        ("photo.png", "image/jpeg", ".png"),
+    ])
+    def test_get_image_extension(self, filename, mime_type, expected):
+        assert get_image_extension(filename, mime_type) == expected
 
 
 class TestFormatSize:
     """Tests for format_size function."""
 
-    def test_zero_bytes(self):
-        assert format_size(0) == "0 B"
-
-    def test_bytes(self):
-        assert format_size(500) == "500 B"
-
-    def test_kilobytes(self):
-        assert format_size(1024) == "1.00 KB"
-        assert format_size(1536) == "1.50 KB"
-
-    def test_megabytes(self):
-        assert format_size(1024 * 1024) == "1.00 MB"
-        assert format_size(1024 * 1024 * 2.5) == "2.50 MB"
-
-    def test_gigabytes(self):
-        assert format_size(1024 * 1024 * 1024) == "1.00 GB"
-
-    def test_terabytes(self):
-        assert format_size(1024 * 1024 * 1024 * 1024) == "1.00 TB"
+    @pytest.mark.parametrize("size_bytes,expected", [
+        (0, "0 B"),
+        (500, "500 B"),
+        (1023, "1023 B"),
+        (1024, "1.00 KB"),
+        (1536, "1.50 KB"),
+        (1024 * 1024 - 1, "1024.00 KB"),
+        (1024 * 1024, "1.00 MB"),
+        (1024 * 1024 * 2.5, "2.50 MB"),
+        (1024 * 1024 * 1024, "1.00 GB"),
+        (1024 * 1024 * 1024 * 1024, "1.00 TB"),
+        (1024 ** 5, "1024.00 TB"),
+    ])
+    def test_format_size(self, size_bytes, expected):
+        assert format_size(size_bytes) == expected
 
 
 class TestIsImageFile:
@@ -149,6 +157,18 @@ class TestIsImageFile:
         item = {"name": "document.pdf", "file": {"mimeType": "application/pdf"}}
         assert is_image_file(item) is False
 
+    def test_rejects_folder_with_image_name(self):
+        assert is_image_file({"name": "holiday.jpg", "folder": {"childCount": 3}}) is False
+
+    def test_rejects_name_without_extension(self):
+        assert is_image_file({"name": "jpg"}) is False
+        assert is_image_file({"name": "photo."}) is False
+        assert is_image_file({}) is False
+
+    def test_uses_last_extension(self):
+        assert is_image_file({"name": "archive.jpg.zip"}) is False
+        assert is_image_file({"name": "scan.2024.TIFF"}) is True
+
     def test_rejects_folder(self):
         item = {"name": "folder", "folder": {"childCount": 5}}
         assert is_image_file(item) is False